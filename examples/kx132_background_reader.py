@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import struct
+import board
+import kx132
+from kx132_acquisition import BackgroundReader
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+kx = kx132.KX132(i2c)
+scale = kx.acceleration_scale
+
+with BackgroundReader(kx, block_samples=50, blocks=8) as reader:
+    while True:
+        block = reader.get()
+        accx, accy, accz = struct.unpack_from("<hhh", block, len(block) - 6)
+        reader.release()
+        print(
+            "x:{:.2f}g, y:{:.2f}g, z:{:.2f}g overruns:{}".format(
+                accx * scale, accy * scale, accz * scale, reader.overruns
+            )
+        )
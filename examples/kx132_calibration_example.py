@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import struct
+import time
+import board
+import kx132
+from kx132_calibration import Calibration
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+kx = kx132.KX132(i2c)
+scale = kx.acceleration_scale
+
+orientations = (
+    ("X up", (1, 0, 0)),
+    ("X down", (-1, 0, 0)),
+    ("Y up", (0, 1, 0)),
+    ("Y down", (0, -1, 0)),
+    ("Z up", (0, 0, 1)),
+    ("Z down", (0, 0, -1)),
+)
+
+captures = []
+references = []
+for name, reference in orientations:
+    print(f"Place the sensor {name} and keep it still")
+    time.sleep(5)
+    capture = bytearray(6 * 50)
+    for start in range(0, len(capture), 6):
+        kx.read_acceleration_raw_into(capture, start)
+        time.sleep(0.02)
+    captures.append(capture)
+    references.append(reference)
+
+cal = Calibration.from_captures(captures, references, scale)
+print(f"Matrix: {cal.matrix}")
+print(f"Bias: {cal.bias}")
+
+block = bytearray(6 * 10)
+while True:
+    for start in range(0, len(block), 6):
+        kx.read_acceleration_raw_into(block, start)
+    cal.apply(block)
+    accx, accy, accz = struct.unpack_from("<hhh", block)
+    print(
+        "x:{:.2f}g, y:{:.2f}g, z:{:.2f}g".format(
+            accx * scale, accy * scale, accz * scale
+        )
+    )
+    time.sleep(0.1)
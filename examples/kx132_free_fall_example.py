@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import time
+import board
+import kx132
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+kx = kx132.KX132(i2c)
+
+# Free fall when every axis stays below 0.5g for 100ms, checked at 100Hz
+kx.free_fall_setup(threshold=0.5, duration=100, output_data_rate=3)
+kx.free_fall_interrupt1 = True
+kx.interrupt1_enabled = True
+kx.interrupt_release_mode = kx132.RELEASE_ON_EVENT
+
+while True:
+    _, ins2, _, _ = kx.interrupt_status
+    if ins2 & 0x80:
+        print("Free fall detected")
+    time.sleep(0.1)
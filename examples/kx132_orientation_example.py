@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import board
+import kx132
+from kx132_orientation import Orientation
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+kx = kx132.KX132(i2c)
+kx.tilt_position_enable = kx132.TILT_ENABLED
+
+orientation = Orientation(16, smoothing=0.8)
+block = bytearray(6 * 16)
+
+while True:
+    for start in range(0, len(block), 6):
+        kx.read_acceleration_raw_into(block, start)
+    count = orientation.update(block)
+    pitch = orientation.pitch[count - 1] / 100
+    roll = orientation.roll[count - 1] / 100
+    face_up = kx.tilt_state == kx132.TILT_FACE_UP
+    print(f"Pitch: {pitch:.2f} Roll: {roll:.2f} Face up: {face_up}")
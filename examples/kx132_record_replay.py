@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import time
+import board
+import kx132
+from kx132_replay import RecordingI2C, ReplayI2C
+
+# Record a session with the sensor connected
+with open("session.kxr", "wb") as stream:
+    kx = kx132.KX132(RecordingI2C(board.I2C(), stream))
+    for _ in range(100):
+        accx, accy, accz = kx.acceleration
+        time.sleep(0.02)
+
+# Replay the same session, with the original timing, without the sensor
+with open("session.kxr", "rb") as stream:
+    kx = kx132.KX132(ReplayI2C(stream, timing=True))
+    for _ in range(100):
+        accx, accy, accz = kx.acceleration
+        print("x:{:.2f}g, y:{:.2f}g, z:{:.2f}g".format(accx, accy, accz))
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+# Reports import time, construction time and heap use of the driver.
+# Run it once with LEAN = True and once with LEAN = False, after a reset,
+# so modules imported by the first run do not hide the cost of the second.
+
+import gc
+import time
+import board
+
+LEAN = True
+
+try:
+    mem_free = gc.mem_free  # CircuitPython
+except AttributeError:
+    import tracemalloc  # Blinka
+
+    tracemalloc.start()
+
+    def mem_free():
+        return -tracemalloc.get_traced_memory()[0]
+
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+
+gc.collect()
+free_start = mem_free()
+start = time.monotonic_ns()
+if LEAN:
+    import kx132_core
+
+    imported = time.monotonic_ns()
+    kx = kx132_core.KX132Core(i2c)
+else:
+    import kx132
+
+    imported = time.monotonic_ns()
+    kx = kx132.KX132(i2c)
+constructed = time.monotonic_ns()
+gc.collect()
+free_end = mem_free()
+
+print("Driver: {}".format("kx132_core" if LEAN else "kx132"))
+print("Import: {:.1f} ms".format((imported - start) / 1e6))
+print("Construction: {:.1f} ms".format((constructed - imported) / 1e6))
+print("Heap used: {} bytes".format(free_start - free_end))
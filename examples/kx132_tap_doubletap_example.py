@@ -10,8 +10,11 @@ i2c = board.I2C()  # uses board.SCL and board.SDA
 kx = kx132.KX132(i2c)
 
 kx.tap_doubletap_enable = kx132.TDTE_ENABLED
+# INT_REL is only read when a tap was latched
+kx.interrupt_release_mode = kx132.RELEASE_ON_EVENT
 
 while True:
-    print(f"Status: {kx.tap_doubletap_report}")
-    kx.interrupt_release()
+    tap, _, _, _ = kx.interrupt_status
+    if tap:
+        print(f"Status: {kx132.tap_doubletap_report_values[tap]}")
     time.sleep(0.3)
@@ -0,0 +1,21 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import board
+import busio
+import kx132
+from kx132_telemetry import SerialSink, TelemetryWriter
+
+i2c = board.I2C()  # uses board.SCL and board.SDA
+kx = kx132.KX132(i2c)
+kx.acc_range = kx132.ACC_RANGE_4
+
+uart = busio.UART(board.TX, board.RX, baudrate=921600)
+writer = TelemetryWriter(SerialSink(uart), sensor_id=1, acc_range=kx132.ACC_RANGE_4)
+
+block = bytearray(6 * 32)
+while True:
+    for start in range(0, len(block), 6):
+        kx.read_acceleration_raw_into(block, start)
+    writer.write_block(block)
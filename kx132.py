@@ -15,13 +15,48 @@ CircuitPython Driver for the Kionix KX132 Accelerometer
 
 import time
 from micropython import const
-from adafruit_bus_device import i2c_device
-from adafruit_register.i2c_struct import ROUnaryStruct, UnaryStruct, Struct
+from adafruit_register.i2c_struct import UnaryStruct, Struct
 from adafruit_register.i2c_bits import RWBits
 from adafruit_register.i2c_bit import RWBit
+from kx132_common import KX132Base
+
+# Settings shared with kx132_core and the feature modules
+# pylint: disable=unused-import
+from kx132_common import (
+    ACC_RANGE_2,
+    ACC_RANGE_4,
+    ACC_RANGE_8,
+    ACC_RANGE_16,
+    acc_range_values,
+    acc_range_factor,
+    LOW_POWER_MODE,
+    HIGH_PERFORMANCE_MODE,
+    performance_mode_values,
+    RELEASE_MANUAL,
+    RELEASE_ON_EVENT,
+    RELEASE_BURST,
+    interrupt_release_mode_values,
+    output_data_rate_values,
+    TILT_FACE_UP,
+    TILT_FACE_DOWN,
+    TILT_UP,
+    TILT_DOWN,
+    TILT_RIGHT,
+    TILT_LEFT,
+    tilt_position_values,
+    tap_doubletap_report_values,
+    FF_LATCHED,
+    FF_UNLATCHED,
+    FF_DEBOUNCE_UP_DOWN,
+    FF_DEBOUNCE_RESET,
+    free_fall_latch_values,
+    free_fall_debounce_values,
+    free_fall_output_data_rate_values,
+)
+
+# pylint: enable=unused-import
 
 try:
-    from busio import I2C
     from typing import Tuple
 except ImportError:
     pass
@@ -32,29 +67,21 @@ __repo__ = "https://github.com/jposada202020/CircuitPython_KX132.git"
 
 _ADP = const(0x02)
 _ACC = const(0x08)
-_REG_WHOAMI = const(0x13)
 _TILT_POSITION = const(0x14)
 _PREVIOUS_TILT_POSITION = const(0x15)
 _INS1 = const(0x16)
 _ODCNTL = const(0x21)
-_INT_REL = const(0x1A)
 _CNTL1 = const(0x1B)
 _CNTL2 = const(0x1C)
 _CNTL5 = const(0x1F)
+_INC1 = const(0x22)
+_INC5 = const(0x26)
 _FFTH = const(0x32)
 _FFCNTL = const(0x34)
 
 STANDBY_MODE = const(0b0)
 NORMAL_MODE = const(0b1)
 
-# Acceleration range
-ACC_RANGE_2 = const(0b00)
-ACC_RANGE_4 = const(0b01)
-ACC_RANGE_8 = const(0b10)
-ACC_RANGE_16 = const(0b11)
-acc_range_values = (ACC_RANGE_2, ACC_RANGE_4, ACC_RANGE_8, ACC_RANGE_16)
-acc_range_factor = {ACC_RANGE_2: 2, ACC_RANGE_4: 4, ACC_RANGE_8: 8, ACC_RANGE_16: 16}
-
 TILT_DISABLED = const(0b0)
 TILT_ENABLED = const(0b1)
 tilt_position_enable_values = (TILT_DISABLED, TILT_ENABLED)
@@ -64,10 +91,6 @@ TDTE_DISABLED = const(0b0)
 TDTE_ENABLED = const(0b1)
 tap_doubletap_enable_values = (TDTE_DISABLED, TDTE_ENABLED)
 
-LOW_POWER_MODE = const(0b0)
-HIGH_PERFORMANCE_MODE = const(0b1)
-performance_mode_values = (LOW_POWER_MODE, HIGH_PERFORMANCE_MODE)
-
 ADP_DISABLED = const(0b0)
 ADP_ENABLED = const(0b1)
 adp_enabled_values = (ADP_DISABLED, ADP_ENABLED)
@@ -76,12 +99,31 @@ FF_DISABLED = const(0b0)
 FF_ENABLED = const(0b1)
 free_fall_enabled_values = (FF_DISABLED, FF_ENABLED)
 
-# pylint: disable=too-many-instance-attributes
-class KX132:
+# Interrupt pin
+INT_ACTIVE_LOW = const(0b0)
+INT_ACTIVE_HIGH = const(0b1)
+interrupt_polarity_values = (INT_ACTIVE_LOW, INT_ACTIVE_HIGH)
+
+INT_LATCHED = const(0b0)
+INT_PULSED = const(0b1)
+interrupt_latch_values = (INT_LATCHED, INT_PULSED)
+
+PULSE_50US = const(0b00)
+PULSE_1_ODR = const(0b01)
+PULSE_2_ODR = const(0b10)
+PULSE_4_ODR = const(0b11)
+interrupt_pulse_width_values = (PULSE_50US, PULSE_1_ODR, PULSE_2_ODR, PULSE_4_ODR)
+
+
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
+class KX132(KX132Base):
     """Driver for the KX132 Sensor connected over I2C.
 
     :param ~busio.I2C i2c_bus: The I2C bus the KX132 is connected to.
     :param int address: The I2C device address. Defaults to :const:`0x1F`
+    :param int acc_range: Acceleration range set at construction. Nothing is
+     written to a sensor already in operating mode with this range.
+     Defaults to :const:`kx132.ACC_RANGE_2`
 
     :raises RuntimeError: if the sensor is not found
 
@@ -110,10 +152,8 @@ class KX132:
 
     """
 
-    _device_id = ROUnaryStruct(_REG_WHOAMI, "B")
     _control_register1 = UnaryStruct(_CNTL1, "B")
     _interrupt1 = UnaryStruct(_INS1, "B")
-    _interrupt_release = UnaryStruct(_INT_REL, "B")
 
     _acceleration_data = Struct(_ACC, "hhh")
     _adp_data = Struct(_ADP, "hhh")
@@ -121,7 +161,7 @@ class KX132:
     _tilt_position = UnaryStruct(_TILT_POSITION, "B")
     _previous_tilt_position = UnaryStruct(_PREVIOUS_TILT_POSITION, "B")
 
-    _free_fall_threshold = UnaryStruct(_FFCNTL, "B")
+    _free_fall_threshold = UnaryStruct(_FFTH, "B")
 
     # Register CNTL1 (0x1B)
     # |PC1|RES|DRDYE|GSEL1|GSEL0|TDTE|----|TPE|
@@ -134,20 +174,25 @@ class KX132:
     _soft_reset = RWBit(_CNTL2, 7)
 
     _adp_enabled = RWBit(_CNTL5, 4)
+
+    # Register FFCNTL (0x34)
+    # |FFIE|ULMODE|FFDC1|FFDC0|DCRM|OFFI2|OFFI1|OFFI0|
     _free_fall_enabled = RWBit(_FFCNTL, 7)
 
     # Register ODCNTL (0x21)
     # |IIR_BYPASS|LPRO|FSTUP|----|OSA3|OSA2|OSA1|OSA0|
     _output_data_rate = RWBits(4, _ODCNTL, 0)
 
-    def __init__(self, i2c_bus: I2C, address: int = 0x1F) -> None:
-        self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
-
-        if self._device_id != 0x3D:
-            raise RuntimeError("Failed to find KX132")
-
-        self._operating_mode = NORMAL_MODE
-        self.acc_range = ACC_RANGE_2
+    # Register INC1 (0x22) and INC5 (0x26)
+    # |PW1|PW0|IEN|IEA|IEL|----|----|----|
+    _interrupt1_pulse_width = RWBits(2, _INC1, 6)
+    _interrupt1_enabled = RWBit(_INC1, 5)
+    _interrupt1_polarity = RWBit(_INC1, 4)
+    _interrupt1_latch = RWBit(_INC1, 3)
+    _interrupt2_pulse_width = RWBits(2, _INC5, 6)
+    _interrupt2_enabled = RWBit(_INC5, 5)
+    _interrupt2_polarity = RWBit(_INC5, 4)
+    _interrupt2_latch = RWBit(_INC5, 3)
 
     def soft_reset(self):
         """
@@ -222,15 +267,7 @@ class KX132:
         ODR frequency determined by OTP<1:0> in CNTL3. Data is protected during
         register read
         """
-        states = {
-            1: "Face-Up State (Z+)",
-            2: "Face-Down State (Z-)",
-            4: "Up State (Y+)",
-            8: "Down State (Y-)",
-            16: "Right State (X+)",
-            32: "Left State (X-)",
-        }
-        return states[self._tilt_position]
+        return tilt_position_values[self._tilt_position]
 
     @property
     def previous_tilt_position(self):
@@ -239,15 +276,26 @@ class KX132:
         ODR frequency determined by OTP<1:0> in CNTL3. Data is protected during
         register read
         """
-        states = {
-            1: "Face-Up State (Z+)",
-            2: "Face-Down State (Z-)",
-            4: "Up State (Y+)",
-            8: "Down State (Y-)",
-            16: "Right State (X+)",
-            32: "Left State (X-)",
-        }
-        return states[self._previous_tilt_position]
+        return tilt_position_values[self._previous_tilt_position]
+
+    @property
+    def tilt_state(self) -> int:
+        """
+        Current Sensor tilt position as an integer, one of
+        :py:const:`kx132.TILT_FACE_UP`, :py:const:`kx132.TILT_FACE_DOWN`,
+        :py:const:`kx132.TILT_UP`, :py:const:`kx132.TILT_DOWN`,
+        :py:const:`kx132.TILT_RIGHT` or :py:const:`kx132.TILT_LEFT`.
+        Cheaper than :attr:`tilt_position` in a loop
+        """
+        return self._tilt_position
+
+    @property
+    def previous_tilt_state(self) -> int:
+        """
+        Previous Sensor tilt position as an integer. Same values as
+        :attr:`tilt_state`
+        """
+        return self._previous_tilt_position
 
     @property
     def tilt_position_enable(self) -> str:
@@ -307,22 +355,164 @@ class KX132:
         by OTDT<2:0> in CNTL3. These bits are cleared when interrupt_release function
         is called.
         """
-        states = {
-            0: "No Tap/Double Tap reported",
-            1: "Z Positive (Z+) Reported",
-            2: "Z Negative (Z-) Reported",
-            4: "Y Positive (Y+) Reported",
-            8: "Y Negative (Y-) Reported",
-            16: "X Positive (X+) Reported",
-            32: "X Negative (X-) Reported",
-        }
-        return states[self._interrupt1]
+        return tap_doubletap_report_values[self._interrupt1]
+
+    @property
+    def interrupt1_enabled(self) -> bool:
+        """
+        Physical interrupt pin INT1 enabled
+        """
+        return bool(self._interrupt1_enabled)
+
+    @interrupt1_enabled.setter
+    def interrupt1_enabled(self, value: bool) -> None:
+        self._operating_mode = STANDBY_MODE
+        self._interrupt1_enabled = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt1_polarity(self) -> str:
+        """
+        Polarity of the physical interrupt pin INT1
+
+        +-----------------------------------+-----------------+
+        | Mode                              | Value           |
+        +===================================+=================+
+        | :py:const:`kx132.INT_ACTIVE_LOW`  | :py:const:`0b0` |
+        +-----------------------------------+-----------------+
+        | :py:const:`kx132.INT_ACTIVE_HIGH` | :py:const:`0b1` |
+        +-----------------------------------+-----------------+
+        """
+        values = ("INT_ACTIVE_LOW", "INT_ACTIVE_HIGH")
+        return values[self._interrupt1_polarity]
+
+    @interrupt1_polarity.setter
+    def interrupt1_polarity(self, value: int) -> None:
+        if value not in interrupt_polarity_values:
+            raise ValueError("Value must be a valid interrupt1_polarity setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt1_polarity = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt1_latch(self) -> str:
+        """
+        Response of the physical interrupt pin INT1. A latched pin stays active
+        until the interrupt is released, a pulsed pin is active for
+        :attr:`interrupt1_pulse_width`.
+
+        +-------------------------------+-----------------+
+        | Mode                          | Value           |
+        +===============================+=================+
+        | :py:const:`kx132.INT_LATCHED` | :py:const:`0b0` |
+        +-------------------------------+-----------------+
+        | :py:const:`kx132.INT_PULSED`  | :py:const:`0b1` |
+        +-------------------------------+-----------------+
+        """
+        values = ("INT_LATCHED", "INT_PULSED")
+        return values[self._interrupt1_latch]
+
+    @interrupt1_latch.setter
+    def interrupt1_latch(self, value: int) -> None:
+        if value not in interrupt_latch_values:
+            raise ValueError("Value must be a valid interrupt1_latch setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt1_latch = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt1_pulse_width(self) -> str:
+        """
+        Pulse width of the physical interrupt pin INT1 in pulsed mode.
+        :py:const:`kx132.PULSE_50US` is 10us when the ODR is over 1600Hz,
+        the other settings are a number of ODR periods.
+
+        +-------------------------------+------------------+
+        | Mode                          | Value            |
+        +===============================+==================+
+        | :py:const:`kx132.PULSE_50US`  | :py:const:`0b00` |
+        +-------------------------------+------------------+
+        | :py:const:`kx132.PULSE_1_ODR` | :py:const:`0b01` |
+        +-------------------------------+------------------+
+        | :py:const:`kx132.PULSE_2_ODR` | :py:const:`0b10` |
+        +-------------------------------+------------------+
+        | :py:const:`kx132.PULSE_4_ODR` | :py:const:`0b11` |
+        +-------------------------------+------------------+
+        """
+        values = ("PULSE_50US", "PULSE_1_ODR", "PULSE_2_ODR", "PULSE_4_ODR")
+        return values[self._interrupt1_pulse_width]
+
+    @interrupt1_pulse_width.setter
+    def interrupt1_pulse_width(self, value: int) -> None:
+        if value not in interrupt_pulse_width_values:
+            raise ValueError("Value must be a valid interrupt1_pulse_width setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt1_pulse_width = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt2_enabled(self) -> bool:
+        """
+        Physical interrupt pin INT2 enabled
+        """
+        return bool(self._interrupt2_enabled)
+
+    @interrupt2_enabled.setter
+    def interrupt2_enabled(self, value: bool) -> None:
+        self._operating_mode = STANDBY_MODE
+        self._interrupt2_enabled = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt2_polarity(self) -> str:
+        """
+        Polarity of the physical interrupt pin INT2. Same settings as
+        :attr:`interrupt1_polarity`
+        """
+        values = ("INT_ACTIVE_LOW", "INT_ACTIVE_HIGH")
+        return values[self._interrupt2_polarity]
+
+    @interrupt2_polarity.setter
+    def interrupt2_polarity(self, value: int) -> None:
+        if value not in interrupt_polarity_values:
+            raise ValueError("Value must be a valid interrupt2_polarity setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt2_polarity = value
+        self._operating_mode = NORMAL_MODE
+
+    @property
+    def interrupt2_latch(self) -> str:
+        """
+        Response of the physical interrupt pin INT2. Same settings as
+        :attr:`interrupt1_latch`
+        """
+        values = ("INT_LATCHED", "INT_PULSED")
+        return values[self._interrupt2_latch]
+
+    @interrupt2_latch.setter
+    def interrupt2_latch(self, value: int) -> None:
+        if value not in interrupt_latch_values:
+            raise ValueError("Value must be a valid interrupt2_latch setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt2_latch = value
+        self._operating_mode = NORMAL_MODE
 
-    def interrupt_release(self):
+    @property
+    def interrupt2_pulse_width(self) -> str:
         """
-        Clear the interrupt register
+        Pulse width of the physical interrupt pin INT2 in pulsed mode. Same
+        settings as :attr:`interrupt1_pulse_width`
         """
-        _ = self._interrupt_release
+        values = ("PULSE_50US", "PULSE_1_ODR", "PULSE_2_ODR", "PULSE_4_ODR")
+        return values[self._interrupt2_pulse_width]
+
+    @interrupt2_pulse_width.setter
+    def interrupt2_pulse_width(self, value: int) -> None:
+        if value not in interrupt_pulse_width_values:
+            raise ValueError("Value must be a valid interrupt2_pulse_width setting")
+        self._operating_mode = STANDBY_MODE
+        self._interrupt2_pulse_width = value
+        self._operating_mode = NORMAL_MODE
 
     @property
     def output_data_rate(self) -> int:
@@ -420,6 +610,11 @@ class KX132:
             raise ValueError("Value must be a valid adp_enabled setting")
         self._adp_enabled = value
 
+    @property
+    def _free_fall(self):
+        # Shared with kx132_core, imported the first time it is used
+        return self._feature("kx132_free_fall", "FreeFall")
+
     @property
     def free_fall_enabled(self) -> str:
         """
@@ -459,3 +654,165 @@ class KX132:
     @free_fall_threshold.setter
     def free_fall_threshold(self, value: int) -> None:
         self._free_fall_threshold = value
+
+    @property
+    def free_fall_threshold_g(self) -> float:
+        """
+        Free Fall Threshold in g. The sensor goes into free fall when the
+        acceleration of every axis is below this value. Resolution is
+        0.0625g, one count of the top 8 bits of the 8g output.
+        """
+        return self._free_fall.threshold
+
+    @free_fall_threshold_g.setter
+    def free_fall_threshold_g(self, value: float) -> None:
+        self._free_fall.threshold = value
+
+    @property
+    def free_fall_counter(self) -> int:
+        """
+        Free Fall Counter. Number of :attr:`free_fall_output_data_rate` periods
+        the acceleration has to stay below the threshold before free fall is
+        reported. See :attr:`free_fall_duration` to set it in milliseconds
+        """
+        return self._free_fall.counter
+
+    @free_fall_counter.setter
+    def free_fall_counter(self, value: int) -> None:
+        self._free_fall.counter = value
+
+    @property
+    def free_fall_duration(self) -> float:
+        """
+        Time in milliseconds the acceleration has to stay below the threshold
+        before free fall is reported. It is stored in :attr:`free_fall_counter`
+        as a number of periods of the current :attr:`free_fall_output_data_rate`,
+        so set the rate first.
+        """
+        return self._free_fall.duration
+
+    @free_fall_duration.setter
+    def free_fall_duration(self, value: float) -> None:
+        self._free_fall.duration = value
+
+    @property
+    def free_fall_output_data_rate(self) -> int:
+        """
+        Output data rate of the free fall engine, OFFI<2:0>. Values go from
+        0 (12.5Hz) to 7 (1600Hz), doubling each step. The rate in Hz for each
+        setting is in :const:`kx132.free_fall_output_data_rate_values`
+        """
+        return self._free_fall.output_data_rate
+
+    @free_fall_output_data_rate.setter
+    def free_fall_output_data_rate(self, value: int) -> None:
+        self._free_fall.output_data_rate = value
+
+    @property
+    def free_fall_latch(self) -> str:
+        """
+        Sensor free_fall_latch. A latched free fall report stays until the
+        interrupt is released, an unlatched one clears by itself after the
+        :attr:`free_fall_delayed_clear` periods once the fall ends.
+
+        +--------------------------------+-----------------+
+        | Mode                           | Value           |
+        +================================+=================+
+        | :py:const:`kx132.FF_LATCHED`   | :py:const:`0b0` |
+        +--------------------------------+-----------------+
+        | :py:const:`kx132.FF_UNLATCHED` | :py:const:`0b1` |
+        +--------------------------------+-----------------+
+        """
+        return self._free_fall.latch
+
+    @free_fall_latch.setter
+    def free_fall_latch(self, value: int) -> None:
+        self._free_fall.latch = value
+
+    @property
+    def free_fall_delayed_clear(self) -> int:
+        """
+        Delay before an unlatched free fall report is cleared, FFDC<1:0>.
+        0 clears it at once, 1, 2 and 3 wait 1, 2 and 4
+        :attr:`free_fall_output_data_rate` periods
+        """
+        return self._free_fall.delayed_clear
+
+    @free_fall_delayed_clear.setter
+    def free_fall_delayed_clear(self, value: int) -> None:
+        self._free_fall.delayed_clear = value
+
+    @property
+    def free_fall_debounce(self) -> str:
+        """
+        Debounce method of the free fall counter. With up/down the counter
+        decrements when a sample is over the threshold, with reset it
+        goes back to zero.
+
+        +---------------------------------------+-----------------+
+        | Mode                                  | Value           |
+        +=======================================+=================+
+        | :py:const:`kx132.FF_DEBOUNCE_UP_DOWN` | :py:const:`0b0` |
+        +---------------------------------------+-----------------+
+        | :py:const:`kx132.FF_DEBOUNCE_RESET`   | :py:const:`0b1` |
+        +---------------------------------------+-----------------+
+        """
+        return self._free_fall.debounce
+
+    @free_fall_debounce.setter
+    def free_fall_debounce(self, value: int) -> None:
+        self._free_fall.debounce = value
+
+    @property
+    def free_fall_interrupt1(self) -> bool:
+        """
+        Free fall reported on the physical interrupt pin INT1
+        """
+        return self._free_fall.interrupt1
+
+    @free_fall_interrupt1.setter
+    def free_fall_interrupt1(self, value: bool) -> None:
+        self._free_fall.interrupt1 = value
+
+    @property
+    def free_fall_interrupt2(self) -> bool:
+        """
+        Free fall reported on the physical interrupt pin INT2
+        """
+        return self._free_fall.interrupt2
+
+    @free_fall_interrupt2.setter
+    def free_fall_interrupt2(self, value: bool) -> None:
+        self._free_fall.interrupt2 = value
+
+    @property
+    def free_fall_detected(self) -> bool:
+        """
+        Free fall reported, FFS bit in INS2. When latched, it stays set until
+        the interrupt is released. It is also bit 0x80 of the second value of
+        :attr:`interrupt_status`
+        """
+        return self._free_fall.detected
+
+    # pylint: disable=too-many-arguments
+    def free_fall_setup(
+        self,
+        threshold: float,
+        duration: float,
+        output_data_rate: int = 3,
+        latch: int = FF_LATCHED,
+        debounce: int = FF_DEBOUNCE_UP_DOWN,
+    ) -> None:
+        """
+        Configure and enable the free fall engine in a single standby period.
+
+        :param float threshold: Threshold in g, see :attr:`free_fall_threshold_g`
+        :param float duration: Duration in milliseconds, see :attr:`free_fall_duration`
+        :param int output_data_rate: Free fall engine rate, see
+         :attr:`free_fall_output_data_rate`. Defaults to :const:`3` (100Hz)
+        :param int latch: See :attr:`free_fall_latch`. Defaults to
+         :const:`kx132.FF_LATCHED`
+        :param int debounce: See :attr:`free_fall_debounce`. Defaults to
+         :const:`kx132.FF_DEBOUNCE_UP_DOWN`
+        """
+        self._free_fall.setup(threshold, duration, output_data_rate, latch, debounce)
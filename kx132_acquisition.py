@@ -0,0 +1,232 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_acquisition`
+================================================================================
+
+Background acquisition for the Kionix KX132 Accelerometer on Blinka/Linux.
+
+The bus reads run in a dedicated thread that fills a ring of preallocated raw
+blocks. The application thread takes filled blocks without copying, so the
+acquisition timing does not depend on how long the processing takes.
+
+This module needs ``threading`` and therefore does not run on CircuitPython.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import threading
+import time
+
+from kx132_common import output_data_rate_values
+
+try:
+    from typing import Optional
+    from kx132_calibration import Calibration
+except ImportError:
+    pass
+
+
+# pylint: disable=too-many-instance-attributes, too-many-arguments
+class BackgroundReader:
+    """Read raw acceleration samples from a :class:`kx132.KX132` in a background thread.
+
+    Samples are stored in ``blocks`` preallocated buffers of ``block_samples`` samples
+    each. Every sample takes 6 bytes, three little-endian signed 16-bit counts (X, Y, Z),
+    as returned by :meth:`kx132.KX132.read_acceleration_raw_into`.
+
+    The ring has a single producer (the reader thread) and a single consumer. Each side
+    only advances its own counter, so no lock is taken to hand a block over. When the
+    consumer falls behind and every block is waiting to be consumed, the reader keeps
+    sampling into a scratch buffer and that block is counted in :attr:`overruns`.
+
+    :param sensor: The sensor to read from, :class:`kx132.KX132` or
+     :class:`kx132_core.KX132Core`
+    :param int block_samples: Number of samples in each block. Defaults to :const:`64`
+    :param int blocks: Number of blocks in the ring. Defaults to :const:`8`
+    :param float rate: Sample rate in Hz. Defaults to the sensor
+     :attr:`~kx132.KX132.output_data_rate`
+    :param ~kx132_calibration.Calibration calibration: Calibration applied to each block
+     in the reader thread before it is handed over. Defaults to `None`, raw counts
+
+    **Quickstart: Importing and using the reader**
+
+    .. code-block:: python
+
+        import board
+        import kx132
+        from kx132_acquisition import BackgroundReader
+
+        i2c = board.I2C()
+        kx = kx132.KX132(i2c)
+
+        with BackgroundReader(kx) as reader:
+            while True:
+                block = reader.get()
+                process(block)
+                reader.release()
+
+    """
+
+    def __init__(
+        self,
+        sensor,
+        block_samples: int = 64,
+        blocks: int = 8,
+        rate: Optional[float] = None,
+        calibration: Optional[Calibration] = None,
+    ) -> None:
+        if block_samples < 1 or blocks < 2:
+            raise ValueError("block_samples must be >= 1 and blocks must be >= 2")
+        if rate is None:
+            rate = output_data_rate_values[sensor.output_data_rate]
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self._sensor = sensor
+        self._calibration = calibration
+        self._period = 1 / rate
+        self._block_samples = block_samples
+        self._block_size = block_samples * 6
+        self._blocks = [bytearray(self._block_size) for _ in range(blocks)]
+        self._views = [memoryview(block) for block in self._blocks]
+        self._scratch = bytearray(self._block_size)
+
+        # Written only by the reader thread / only by the consumer respectively
+        self._head = 0
+        self._tail = 0
+        self._overruns = 0
+
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._error = None
+
+    @property
+    def block_samples(self) -> int:
+        """Number of samples in each block"""
+        return self._block_samples
+
+    @property
+    def overruns(self) -> int:
+        """Number of blocks dropped because the consumer did not release them in time"""
+        return self._overruns
+
+    @property
+    def available(self) -> int:
+        """Number of filled blocks waiting to be consumed"""
+        return self._head - self._tail
+
+    @property
+    def running(self) -> bool:
+        """True while the reader thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the reader thread"""
+        if self.running:
+            raise RuntimeError("BackgroundReader is already running")
+        self._stop.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, name="kx132-reader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Ask the reader thread to finish and wait for it. Blocks already filled
+        stay available to :meth:`get`.
+
+        :param float timeout: Seconds to wait for the thread. Defaults to wait forever
+        """
+        self._stop.set()
+        self._ready.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                raise RuntimeError("BackgroundReader thread did not stop")
+            self._thread = None
+
+    def get(self, timeout: Optional[float] = None) -> Optional[memoryview]:
+        """
+        Return the oldest filled block as a :class:`memoryview` over the ring buffer.
+        The block belongs to the caller until :meth:`release` is called, and its
+        content must not be used after that.
+
+        :param float timeout: Seconds to wait for a block. Defaults to wait forever
+        :return: The block, or `None` if no block arrived in time or the reader
+         was stopped
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._head == self._tail:
+            if self._error is not None:
+                raise RuntimeError("BackgroundReader thread failed") from self._error
+            if not self.running:
+                return None
+            self._ready.clear()
+            # Check again, the reader may have published before the clear
+            if self._head != self._tail:
+                break
+            if deadline is None:
+                self._ready.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._ready.wait(remaining):
+                    return None
+        return self._views[self._tail % len(self._blocks)]
+
+    def release(self) -> None:
+        """Give the block returned by :meth:`get` back to the reader"""
+        if self._head == self._tail:
+            raise RuntimeError("No block to release")
+        self._tail += 1
+
+    def _run(self) -> None:  # pylint: disable=too-many-branches
+        read_into = self._sensor.read_acceleration_raw_into
+        blocks = self._blocks
+        count = len(blocks)
+        size = self._block_size
+        period = self._period
+        next_time = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                head = self._head
+                if head - self._tail < count:
+                    block = blocks[head % count]
+                    dropped = False
+                else:
+                    block = self._scratch
+                    dropped = True
+                for start in range(0, size, 6):
+                    delay = next_time - time.monotonic()
+                    if delay < -period:
+                        # Too far behind, do not try to catch up in a burst
+                        next_time -= delay
+                    # Unlike time.sleep, the wait ends as soon as stop() is called
+                    if self._stop.wait(delay if delay > 0 else 0):
+                        return
+                    read_into(block, start)
+                    next_time += period
+                if dropped:
+                    self._overruns += 1
+                else:
+                    if self._calibration is not None:
+                        self._calibration.apply(block)
+                    self._head = head + 1
+                    self._ready.set()
+        except Exception as error:  # pylint: disable=broad-except
+            self._error = error
+        finally:
+            self._ready.set()
+
+    def __enter__(self) -> "BackgroundReader":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_adp`
+================================================================================
+
+Advanced data path of the Kionix KX132 Accelerometer, for :class:`kx132_core.KX132Core`
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import struct
+from micropython import const
+
+try:
+    from typing import Tuple
+except ImportError:
+    pass
+
+_ADP = const(0x02)
+_CNTL5 = const(0x1F)
+_ADP_EN = const(0x10)
+_ADP_REGISTER = bytes((_ADP,))
+
+
+class ADP:
+    """Advanced data path. Use it through :attr:`kx132_core.KX132Core.adp`
+
+    :param ~kx132_core.KX132Core sensor: The sensor
+    """
+
+    def __init__(self, sensor) -> None:
+        self._sensor = sensor
+        self._buffer = bytearray(6)
+
+    @property
+    def enabled(self) -> bool:
+        """Advanced data path enabled, ADP_EN bit in CNTL5"""
+        return bool(self._sensor.read_register(_CNTL5) & _ADP_EN)
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._sensor.update_register(_CNTL5, _ADP_EN, _ADP_EN if value else 0)
+
+    @property
+    def data(self) -> Tuple[float, float, float]:
+        """
+        Advanced data path output in g, same as
+        :attr:`kx132.KX132.advanced_data_path`
+        """
+        with self._sensor.i2c_device as i2c:
+            i2c.write_then_readinto(_ADP_REGISTER, self._buffer)
+        bufx, bufy, bufz = struct.unpack("<hhh", self._buffer)
+
+        scale = self._sensor.acceleration_scale
+
+        return bufx * scale, bufy * scale, bufz * scale
@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_calibration`
+================================================================================
+
+Offset, gain and axis-alignment calibration for the Kionix KX132 Accelerometer.
+
+The correction is applied to blocks of raw counts, as filled by
+:meth:`kx132.KX132.read_acceleration_raw_into`, using fixed-point coefficients
+computed once. When ``ulab`` or ``numpy`` is available the whole block is
+corrected at once.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import struct
+
+try:
+    from ulab import numpy as np
+
+    _ULAB = True
+except ImportError:
+    _ULAB = False
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+try:
+    from typing import Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+_FRACTION_BITS = 14
+_ROUNDING = 1 << (_FRACTION_BITS - 1)
+
+
+def _solve(matrix, vector):
+    """Solve ``matrix @ x = vector`` with Gauss-Jordan elimination"""
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+    for col in range(size):
+        pivot = col
+        for row in range(col + 1, size):
+            if abs(rows[row][col]) > abs(rows[pivot][col]):
+                pivot = row
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("Captures do not cover enough orientations")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for row in range(size):
+            if row != col:
+                ratio = rows[row][col] / rows[col][col]
+                for k in range(col, size + 1):
+                    rows[row][k] -= ratio * rows[col][k]
+    return [rows[i][size] / rows[i][i] for i in range(size)]
+
+
+def _mean_counts(block) -> Tuple[float, float, float]:
+    samples = len(block) // 6
+    if samples == 0:
+        raise ValueError("Capture is empty")
+    total_x = total_y = total_z = 0
+    for start in range(0, samples * 6, 6):
+        x, y, z = struct.unpack_from("<hhh", block, start)
+        total_x += x
+        total_y += y
+        total_z += z
+    return total_x / samples, total_y / samples, total_z / samples
+
+
+class Calibration:
+    """Per-axis offset and gain correction followed by a rotation to the machine axes.
+
+    Corrected counts are ``rotation @ (gain * (raw - offset))``. They stay in the
+    same scale as the raw counts, so :attr:`kx132.KX132.acceleration_scale` still
+    converts them to g.
+
+    :param offset: Offset of each axis, in counts. Defaults to no offset
+    :param gain: Gain of each axis. Defaults to :const:`1`
+    :param rotation: 3x3 rotation matrix, as rows. Defaults to no rotation
+
+    **Quickstart: Deriving and applying a calibration**
+
+    .. code-block:: python
+
+        import board
+        import kx132
+        from kx132_calibration import Calibration
+
+        i2c = board.I2C()
+        kx = kx132.KX132(i2c)
+
+        # captures holds one raw block per orientation and references the
+        # gravity vector, in g, expected in the machine axes for each of them
+        cal = Calibration.from_captures(captures, references, kx.acceleration_scale)
+
+        block = bytearray(6 * 32)
+        for start in range(0, len(block), 6):
+            kx.read_acceleration_raw_into(block, start)
+        cal.apply(block)
+
+    """
+
+    def __init__(
+        self,
+        offset: Sequence[float] = (0, 0, 0),
+        gain: Sequence[float] = (1, 1, 1),
+        rotation: Optional[Sequence[Sequence[float]]] = None,
+    ) -> None:
+        if rotation is None:
+            rotation = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+        matrix = [[rotation[i][j] * gain[j] for j in range(3)] for i in range(3)]
+        bias = [-sum(matrix[i][j] * offset[j] for j in range(3)) for i in range(3)]
+        self._set(matrix, bias)
+
+    @classmethod
+    def from_captures(
+        cls,
+        captures: Sequence,
+        references: Sequence[Sequence[float]],
+        scale: float,
+    ) -> "Calibration":
+        """
+        Derive the calibration from raw blocks captured while the sensor was static
+        in several orientations. The fit is a least squares solution, so at least
+        four orientations are needed. The usual six, each axis pointing up and down,
+        give the best result.
+
+        :param captures: Raw blocks, one for each orientation
+        :param references: Gravity vector in g expected in the machine axes
+         for each capture, for example ``(0, 0, 1)`` when lying flat
+        :param float scale: g per count of the captures, usually
+         :attr:`kx132.KX132.acceleration_scale`
+        """
+        if len(captures) != len(references):
+            raise ValueError("Each capture needs a reference vector")
+        if len(captures) < 4:
+            raise ValueError("At least four orientations are needed")
+
+        rows = [_mean_counts(capture) + (1,) for capture in captures]
+        normal = [
+            [sum(row[i] * row[j] for row in rows) for j in range(4)] for i in range(4)
+        ]
+
+        matrix = []
+        bias = []
+        for axis in range(3):
+            target = [ref[axis] / scale for ref in references]
+            right = [sum(row[i] * t for row, t in zip(rows, target)) for i in range(4)]
+            coefficients = _solve(normal, right)
+            matrix.append(coefficients[:3])
+            bias.append(coefficients[3])
+
+        calibration = cls()
+        calibration._set(matrix, bias)  # pylint: disable=protected-access
+        return calibration
+
+    def _set(self, matrix, bias) -> None:
+        self.matrix = tuple(tuple(row) for row in matrix)
+        """Correction matrix, gain and rotation together, as rows"""
+        self.bias = tuple(bias)
+        """Correction added after the matrix, in counts"""
+
+        one = 1 << _FRACTION_BITS
+        self._coefficients = tuple(
+            round(value * one) for row in matrix for value in row
+        )
+        self._bias = tuple(round(value * one) + _ROUNDING for value in bias)
+        self._work = {}
+
+        if np is not None:
+            if _ULAB:
+                # Same fixed-point coefficients as the integer path, as float
+                self._np_matrix = (
+                    np.array(self._coefficients).reshape((3, 3)).transpose() / one
+                )
+                self._np_bias = np.array(self._bias) / one
+            else:
+                self._np_matrix = np.array(self._coefficients, dtype=np.int64).reshape(
+                    (3, 3)
+                )
+                self._np_bias = np.array(self._bias, dtype=np.int64)
+
+    def apply(self, block, out=None) -> None:
+        """
+        Correct a block of raw counts. Results are rounded and saturated to 16 bits.
+
+        :param bytearray block: Raw counts, as filled by
+         :meth:`kx132.KX132.read_acceleration_raw_into`
+        :param bytearray out: Buffer for the corrected counts, same size as ``block``.
+         Defaults to correct ``block`` in place
+        """
+        if out is None:
+            out = block
+        if np is None:
+            self._apply_integer(block, out)
+        elif _ULAB:
+            self._apply_ulab(block, out)
+        else:
+            self._apply_numpy(block, out)
+
+    def _apply_integer(self, block, out) -> None:  # pylint: disable=too-many-locals
+        c_xx, c_xy, c_xz, c_yx, c_yy, c_yz, c_zx, c_zy, c_zz = self._coefficients
+        b_x, b_y, b_z = self._bias
+        shift = _FRACTION_BITS
+        for start in range(0, len(block) - len(block) % 6, 6):
+            x, y, z = struct.unpack_from("<hhh", block, start)
+            struct.pack_into(
+                "<hhh",
+                out,
+                start,
+                max(
+                    -32768, min(32767, (c_xx * x + c_xy * y + c_xz * z + b_x) >> shift)
+                ),
+                max(
+                    -32768, min(32767, (c_yx * x + c_yy * y + c_yz * z + b_y) >> shift)
+                ),
+                max(
+                    -32768, min(32767, (c_zx * x + c_zy * y + c_zz * z + b_z) >> shift)
+                ),
+            )
+
+    def _apply_numpy(self, block, out) -> None:
+        samples = len(block) // 6
+        work = self._work.get(samples)
+        if work is None:
+            # Work arrays are kept per block size so the next blocks reuse them
+            work = (np.empty((samples, 3), np.int64), np.empty((samples, 3), np.int64))
+            self._work[samples] = work
+        counts, result = work
+        counts[...] = np.frombuffer(block, np.int16, samples * 3).reshape((samples, 3))
+        np.matmul(counts, self._np_matrix.T, out=result)
+        np.add(result, self._np_bias, out=result)
+        np.right_shift(result, _FRACTION_BITS, out=result)
+        np.clip(result, -32768, 32767, out=result)
+        np.frombuffer(out, np.int16, samples * 3).reshape((samples, 3))[...] = result
+
+    def _apply_ulab(self, block, out) -> None:
+        # ulab has no 32-bit integers, the block is corrected in float with the
+        # fixed-point coefficients. The rounding offset is in the bias, so the
+        # floor rounds half up like the integer path; float32 builds may still
+        # differ by one count for large products. The bias is added in place and
+        # the result is written straight into ``out``. np.dot, np.floor and
+        # np.clip take no out= argument in ulab, so each still allocates one
+        # array per block.
+        samples = len(block) // 6
+        counts = np.frombuffer(block, dtype=np.int16, count=samples * 3).reshape(
+            (samples, 3)
+        )
+        result = np.dot(counts, self._np_matrix)
+        result += self._np_bias
+        result = np.clip(np.floor(result), -32768, 32767)
+        np.frombuffer(out, dtype=np.int16, count=samples * 3)[:] = result.reshape(
+            (samples * 3,)
+        )
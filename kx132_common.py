@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_common`
+================================================================================
+
+Settings and register access shared by :class:`kx132.KX132` and
+:class:`kx132_core.KX132Core`. The feature modules work on any sensor built on
+:class:`KX132Base`.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+from micropython import const
+from adafruit_bus_device import i2c_device
+
+try:
+    from busio import I2C
+    from typing import Tuple
+except ImportError:
+    pass
+
+_ACC = const(0x08)
+_REG_WHOAMI = const(0x13)
+_INS1 = const(0x16)
+_INT_REL = const(0x1A)
+_CNTL1 = const(0x1B)
+
+# Register CNTL1 (0x1B)
+# |PC1|RES|DRDYE|GSEL1|GSEL0|TDTE|----|TPE|
+_PC1 = const(0x80)
+_GSEL = const(0x18)
+_STATUS_INT = const(0x10)
+
+# Acceleration range
+ACC_RANGE_2 = const(0b00)
+ACC_RANGE_4 = const(0b01)
+ACC_RANGE_8 = const(0b10)
+ACC_RANGE_16 = const(0b11)
+acc_range_values = (ACC_RANGE_2, ACC_RANGE_4, ACC_RANGE_8, ACC_RANGE_16)
+acc_range_factor = {ACC_RANGE_2: 2, ACC_RANGE_4: 4, ACC_RANGE_8: 8, ACC_RANGE_16: 16}
+
+LOW_POWER_MODE = const(0b0)
+HIGH_PERFORMANCE_MODE = const(0b1)
+performance_mode_values = (LOW_POWER_MODE, HIGH_PERFORMANCE_MODE)
+
+# Interrupt release strategy
+RELEASE_MANUAL = const(0)
+RELEASE_ON_EVENT = const(1)
+RELEASE_BURST = const(2)
+interrupt_release_mode_values = (RELEASE_MANUAL, RELEASE_ON_EVENT, RELEASE_BURST)
+
+# Output data rate in Hz for each OSA<3:0> setting
+output_data_rate_values = (
+    0.781,
+    1.563,
+    3.125,
+    6.25,
+    12.5,
+    25,
+    50,
+    100,
+    200,
+    400,
+    800,
+    1600,
+    3200,
+    6400,
+    12800,
+    25600,
+)
+
+# Tilt position states
+TILT_FACE_UP = const(0x01)
+TILT_FACE_DOWN = const(0x02)
+TILT_UP = const(0x04)
+TILT_DOWN = const(0x08)
+TILT_RIGHT = const(0x10)
+TILT_LEFT = const(0x20)
+tilt_position_values = {
+    TILT_FACE_UP: "Face-Up State (Z+)",
+    TILT_FACE_DOWN: "Face-Down State (Z-)",
+    TILT_UP: "Up State (Y+)",
+    TILT_DOWN: "Down State (Y-)",
+    TILT_RIGHT: "Right State (X+)",
+    TILT_LEFT: "Left State (X-)",
+}
+
+tap_doubletap_report_values = {
+    0: "No Tap/Double Tap reported",
+    1: "Z Positive (Z+) Reported",
+    2: "Z Negative (Z-) Reported",
+    4: "Y Positive (Y+) Reported",
+    8: "Y Negative (Y-) Reported",
+    16: "X Positive (X+) Reported",
+    32: "X Negative (X-) Reported",
+}
+
+# Free fall
+FF_LATCHED = const(0b0)
+FF_UNLATCHED = const(0b1)
+free_fall_latch_values = (FF_LATCHED, FF_UNLATCHED)
+
+FF_DEBOUNCE_UP_DOWN = const(0b0)
+FF_DEBOUNCE_RESET = const(0b1)
+free_fall_debounce_values = (FF_DEBOUNCE_UP_DOWN, FF_DEBOUNCE_RESET)
+
+# Free fall engine rate in Hz for each OFFI<2:0> setting
+free_fall_output_data_rate_values = (12.5, 25, 50, 100, 200, 400, 800, 1600)
+
+_ACC_REGISTER = bytes((_ACC,))
+_INS1_REGISTER = bytes((_INS1,))
+
+
+class KX132Base:
+    """Register access and interrupt status of a KX132 connected over I2C.
+
+    The sensor is put in operating mode with the ``acc_range`` setting. If it
+    is already running with that range, nothing is written to it.
+
+    :param ~busio.I2C i2c_bus: The I2C bus the KX132 is connected to.
+    :param int address: The I2C device address. Defaults to :const:`0x1F`
+    :param int acc_range: Acceleration range set at construction.
+     Defaults to :const:`kx132.ACC_RANGE_2`
+
+    :raises RuntimeError: if the sensor is not found
+    """
+
+    def __init__(
+        self, i2c_bus: I2C, address: int = 0x1F, acc_range: int = ACC_RANGE_2
+    ) -> None:
+        if acc_range not in acc_range_values:
+            raise ValueError("Value must be a valid acc_range setting")
+        self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
+        self._register_buffer = bytearray(2)
+        self._interrupt_buffer = bytearray(5)
+        self._interrupt_release_mode = RELEASE_MANUAL
+        self._features = {}
+
+        if self.read_register(_REG_WHOAMI) != 0x3D:
+            raise RuntimeError("Failed to find KX132")
+
+        cntl1 = self.read_register(_CNTL1)
+        if cntl1 & (_PC1 | _GSEL) != _PC1 | acc_range << 3:
+            if cntl1 & _PC1:
+                self.write_register(_CNTL1, cntl1 & ~_PC1)
+            # The range and operating mode go in the same write
+            self.write_register(_CNTL1, (cntl1 & ~_GSEL) | acc_range << 3 | _PC1)
+        self._acc_range_mem = acc_range
+
+    def read_register(self, register: int) -> int:
+        """
+        Read one register
+
+        :param int register: Register address
+        """
+        buf = self._register_buffer
+        buf[0] = register
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(buf, buf, out_end=1, in_start=1)
+        return buf[1]
+
+    def write_register(self, register: int, value: int) -> None:
+        """
+        Write one register
+
+        :param int register: Register address
+        :param int value: Register value
+        """
+        buf = self._register_buffer
+        buf[0] = register
+        buf[1] = value
+        with self.i2c_device as i2c:
+            i2c.write(buf)
+
+    def update_register(self, register: int, mask: int, value: int) -> None:
+        """
+        Change the ``mask`` bits of a register to ``value`` with the sensor in
+        standby, as the data sheet requires for configuration changes, then
+        return to the previous operating mode.
+
+        :param int register: Register address
+        :param int mask: Bits to change
+        :param int value: New value of the bits, already shifted in place
+        """
+        cntl1 = self.read_register(_CNTL1)
+        if cntl1 & _PC1:
+            self.write_register(_CNTL1, cntl1 & ~_PC1)
+        if register == _CNTL1:
+            cntl1 = (cntl1 & ~mask) | value
+        else:
+            current = self.read_register(register)
+            self.write_register(register, (current & ~mask) | value)
+        self.write_register(_CNTL1, cntl1)
+
+    def _feature(self, module: str, name: str):
+        feature = self._features.get(name)
+        if feature is None:
+            feature = getattr(__import__(module), name)(self)
+            self._features[name] = feature
+        return feature
+
+    @property
+    def acceleration_scale(self) -> float:
+        """
+        Acceleration represented by one count of the raw output data, in g,
+        for the current :attr:`acc_range`.
+        """
+        return acc_range_factor[self._acc_range_mem] / 2**15
+
+    def read_acceleration_raw_into(self, buf, start: int = 0) -> None:
+        """
+        Read one XYZ sample of raw acceleration counts into ``buf[start:start + 6]``
+        without allocating. Counts are stored as they come from the sensor, three
+        little-endian signed 16-bit values. Multiply them by :attr:`acceleration_scale`
+        to get g.
+
+        :param bytearray buf: Buffer to store the sample
+        :param int start: Offset in ``buf`` where the sample is stored. Defaults to 0
+        """
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(
+                _ACC_REGISTER, buf, in_start=start, in_end=start + 6
+            )
+
+    def interrupt_release(self) -> None:
+        """
+        Clear the interrupt register
+        """
+        self.read_register(_INT_REL)
+
+    @property
+    def interrupt_status(self) -> Tuple[int, int, int, int]:
+        """
+        Interrupt source registers INS1, INS2, INS3 and STATUS_REG, read in one
+        transaction. The INT bit (0x10) of STATUS_REG is set while any latched
+        interrupt is reported. After the read the interrupts are released
+        according to :attr:`interrupt_release_mode`.
+        """
+        buf = self._interrupt_buffer
+        burst = self._interrupt_release_mode == RELEASE_BURST
+        with self.i2c_device as i2c:
+            # Reading up to INT_REL releases the interrupts in the same burst
+            i2c.write_then_readinto(_INS1_REGISTER, buf, in_end=5 if burst else 4)
+        if self._interrupt_release_mode == RELEASE_ON_EVENT and buf[3] & _STATUS_INT:
+            self.interrupt_release()
+        return buf[0], buf[1], buf[2], buf[3]
+
+    @property
+    def interrupt_release_mode(self) -> str:
+        """
+        How :attr:`interrupt_status` releases the latched interrupts
+
+        +------------------------------------+-------------------------------------------+
+        | Mode                               | Behaviour                                 |
+        +====================================+===========================================+
+        | :py:const:`kx132.RELEASE_MANUAL`   | Never, call :meth:`interrupt_release`     |
+        +------------------------------------+-------------------------------------------+
+        | :py:const:`kx132.RELEASE_ON_EVENT` | Read INT_REL only if an event was latched |
+        +------------------------------------+-------------------------------------------+
+        | :py:const:`kx132.RELEASE_BURST`    | Read INT_REL in the same burst as the     |
+        |                                    | status registers                          |
+        +------------------------------------+-------------------------------------------+
+        """
+        values = ("RELEASE_MANUAL", "RELEASE_ON_EVENT", "RELEASE_BURST")
+        return values[self._interrupt_release_mode]
+
+    @interrupt_release_mode.setter
+    def interrupt_release_mode(self, value: int) -> None:
+        if value not in interrupt_release_mode_values:
+            raise ValueError("Value must be a valid interrupt_release_mode setting")
+        self._interrupt_release_mode = value
@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_core`
+================================================================================
+
+Lean CircuitPython Driver for the Kionix KX132 Accelerometer
+
+:class:`KX132Core` covers acceleration, range, output data rate and interrupt
+status with plain register access instead of ``adafruit_register`` descriptors,
+so importing and constructing it takes less time and heap than :class:`kx132.KX132`.
+The tilt, tap, advanced data path and free fall engines live in their own
+modules, imported the first time they are used.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import struct
+import time
+from micropython import const
+from kx132_common import KX132Base
+
+# Shared settings, available from this module too
+# pylint: disable=unused-import
+from kx132_common import (
+    ACC_RANGE_2,
+    ACC_RANGE_4,
+    ACC_RANGE_8,
+    ACC_RANGE_16,
+    acc_range_values,
+    acc_range_factor,
+    LOW_POWER_MODE,
+    HIGH_PERFORMANCE_MODE,
+    performance_mode_values,
+    RELEASE_MANUAL,
+    RELEASE_ON_EVENT,
+    RELEASE_BURST,
+    interrupt_release_mode_values,
+    output_data_rate_values,
+)
+
+# pylint: enable=unused-import
+
+try:
+    from busio import I2C
+    from typing import Tuple
+except ImportError:
+    pass
+
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/jposada202020/CircuitPython_KX132.git"
+
+_CNTL1 = const(0x1B)
+_CNTL2 = const(0x1C)
+_ODCNTL = const(0x21)
+
+# Register CNTL1 (0x1B)
+# |PC1|RES|DRDYE|GSEL1|GSEL0|TDTE|----|TPE|
+_PC1 = const(0x80)
+_RES = const(0x40)
+_GSEL = const(0x18)
+_OSA = const(0x0F)
+_SRST = const(0x80)
+
+
+class KX132Core(KX132Base):
+    """Lean driver for the KX132 Sensor connected over I2C.
+
+    :param ~busio.I2C i2c_bus: The I2C bus the KX132 is connected to.
+    :param int address: The I2C device address. Defaults to :const:`0x1F`
+    :param int acc_range: Acceleration range set at construction. Nothing is
+     written to a sensor already in operating mode with this range.
+     Defaults to :const:`kx132_core.ACC_RANGE_2`
+
+    :raises RuntimeError: if the sensor is not found
+
+    **Quickstart: Importing and using the device**
+
+    Here is an example of using the :class:`KX132Core` class.
+    First you will need to import the libraries to use the sensor
+
+    .. code-block:: python
+
+        import board
+        import kx132_core
+
+    Once this is done you can define your `board.I2C` object and define your sensor object
+
+    .. code-block:: python
+
+        i2c = board.I2C()  # uses board.SCL and board.SDA
+        kx = kx132_core.KX132Core(i2c)
+
+    Now you have access to the attributes. The feature engines are loaded on
+    first use
+
+    .. code-block:: python
+
+        accx, accy, accz = kx.acceleration
+        kx.tilt.enabled = True
+
+    """
+
+    def __init__(
+        self, i2c_bus: I2C, address: int = 0x1F, acc_range: int = ACC_RANGE_2
+    ) -> None:
+        super().__init__(i2c_bus, address, acc_range)
+        self._data_buffer = bytearray(6)
+
+    @property
+    def tilt(self):
+        """Tilt position engine, :class:`kx132_tilt.Tilt`"""
+        return self._feature("kx132_tilt", "Tilt")
+
+    @property
+    def tap(self):
+        """Tap/Double Tap engine, :class:`kx132_tap.Tap`"""
+        return self._feature("kx132_tap", "Tap")
+
+    @property
+    def adp(self):
+        """Advanced data path, :class:`kx132_adp.ADP`"""
+        return self._feature("kx132_adp", "ADP")
+
+    @property
+    def free_fall(self):
+        """Free fall engine, :class:`kx132_free_fall.FreeFall`"""
+        return self._feature("kx132_free_fall", "FreeFall")
+
+    def soft_reset(self) -> None:
+        """
+        The Software Reset bit initiates software reset, which performs
+        the RAM reboot routine. The sensor is then put back in operating mode
+        with the default configuration and :const:`kx132_core.ACC_RANGE_2`.
+        """
+        cntl1 = self.read_register(_CNTL1)
+        self.write_register(_CNTL1, cntl1 & ~_PC1)
+        self.write_register(_CNTL2, _SRST)
+        time.sleep(0.05)
+        # The reset leaves CNTL1 cleared, in standby
+        self.write_register(_CNTL1, _PC1 | ACC_RANGE_2 << 3)
+        self._acc_range_mem = ACC_RANGE_2
+
+    @property
+    def acc_range(self) -> str:
+        """
+        Acceleration range of the accelerometer outputs, same settings as
+        :attr:`kx132.KX132.acc_range`
+        """
+        values = (
+            "ACC_RANGE_2",
+            "ACC_RANGE_4",
+            "ACC_RANGE_8",
+            "ACC_RANGE_16",
+        )
+        return values[self._acc_range_mem]
+
+    @acc_range.setter
+    def acc_range(self, value: int) -> None:
+        if value not in acc_range_values:
+            raise ValueError("Value must be a valid acc_range setting")
+        self.update_register(_CNTL1, _GSEL, value << 3)
+        self._acc_range_mem = value
+
+    @property
+    def acceleration(self) -> Tuple[float, float, float]:
+        """
+        Acceleration in g, updated every :attr:`output_data_rate` period
+        """
+        self.read_acceleration_raw_into(self._data_buffer)
+        bufx, bufy, bufz = struct.unpack("<hhh", self._data_buffer)
+
+        factor = acc_range_factor[self._acc_range_mem]
+
+        return (
+            bufx / 2**15 * factor,
+            bufy / 2**15 * factor,
+            bufz / 2**15 * factor,
+        )
+
+    @property
+    def output_data_rate(self) -> int:
+        """
+        Output Data Rate setting, OSA<3:0>. Same settings as
+        :attr:`kx132.KX132.output_data_rate`, the rate in Hz for each of them is in
+        :const:`kx132_core.output_data_rate_values`
+        """
+        return self.read_register(_ODCNTL) & _OSA
+
+    @output_data_rate.setter
+    def output_data_rate(self, value: int) -> None:
+        if self.read_register(_CNTL1) & _RES:
+            valid_range = range(10, 16)
+        else:
+            valid_range = range(0, 10)
+        if value not in valid_range:
+            raise ValueError(
+                "Value must be a valid setting in relation with the performance mode"
+            )
+        self.update_register(_ODCNTL, _OSA, value)
+
+    @property
+    def performance_mode(self) -> str:
+        """
+        Sensor performance_mode, same settings as :attr:`kx132.KX132.performance_mode`
+        """
+        values = ("LOW_POWER_MODE", "HIGH_PERFORMANCE_MODE")
+        return values[bool(self.read_register(_CNTL1) & _RES)]
+
+    @performance_mode.setter
+    def performance_mode(self, value: int) -> None:
+        if value not in performance_mode_values:
+            raise ValueError("Value must be a valid performance_mode setting")
+        self.update_register(_CNTL1, _RES, value << 6)
@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_free_fall`
+================================================================================
+
+Free fall engine of the Kionix KX132 Accelerometer, for :class:`kx132_core.KX132Core`
+and :class:`kx132.KX132`
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+from micropython import const
+
+# Free fall settings, shared with kx132
+# pylint: disable=unused-import
+from kx132_common import (
+    FF_LATCHED,
+    FF_UNLATCHED,
+    FF_DEBOUNCE_UP_DOWN,
+    FF_DEBOUNCE_RESET,
+    free_fall_latch_values,
+    free_fall_debounce_values,
+    free_fall_output_data_rate_values,
+)
+
+# pylint: enable=unused-import
+
+try:
+    from typing import Tuple
+except ImportError:
+    pass
+
+_INS2 = const(0x17)
+_CNTL1 = const(0x1B)
+_PC1 = const(0x80)
+_INC4 = const(0x25)
+_INC6 = const(0x27)
+_FFTH = const(0x32)
+_FFC = const(0x33)
+_FFCNTL = const(0x34)
+
+# Register FFCNTL (0x34)
+# |FFIE|ULMODE|FFDC1|FFDC0|DCRM|OFFI2|OFFI1|OFFI0|
+_FFIE = const(0x80)
+_ULMODE = const(0x40)
+_FFDC = const(0x30)
+_DCRM = const(0x08)
+_OFFI = const(0x07)
+_FFI = const(0x80)
+_FFS = const(0x80)
+
+
+# pylint: disable=too-many-arguments
+def free_fall_settings(
+    threshold: float,
+    duration: float,
+    output_data_rate: int,
+    latch: int,
+    debounce: int,
+) -> Tuple[int, int, int]:
+    """
+    Check a free fall configuration and convert it to register values
+
+    :return: FFTH and FFC values, and the FFCNTL value with the engine enabled
+     and FFDC<1:0> left to zero
+    """
+    counts = round(threshold * 16)
+    if threshold < 0 or counts > 255:
+        raise ValueError("Threshold must be between 0 and 15.9375g")
+    if output_data_rate not in range(0, 8):
+        raise ValueError("Value must be a valid free_fall_output_data_rate setting")
+    if duration <= 0:
+        raise ValueError("Duration must be greater than 0")
+    rate = free_fall_output_data_rate_values[output_data_rate]
+    counter = max(1, round(duration * rate / 1000))
+    if counter > 255:
+        raise ValueError("Duration is too long for this output data rate")
+    if latch not in free_fall_latch_values:
+        raise ValueError("Value must be a valid free_fall_latch setting")
+    if debounce not in free_fall_debounce_values:
+        raise ValueError("Value must be a valid free_fall_debounce setting")
+    return counts, counter, _FFIE | latch << 6 | debounce << 3 | output_data_rate
+
+
+class FreeFall:
+    """Free fall engine. Use it through :attr:`kx132_core.KX132Core.free_fall`.
+    The ``free_fall_*`` attributes of :class:`kx132.KX132` are served by it too.
+
+    :param ~kx132_common.KX132Base sensor: The sensor
+    """
+
+    def __init__(self, sensor) -> None:
+        self._sensor = sensor
+
+    @property
+    def enabled(self) -> bool:
+        """Free fall engine enabled, FFIE bit in FFCNTL"""
+        return bool(self._sensor.read_register(_FFCNTL) & _FFIE)
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._sensor.update_register(_FFCNTL, _FFIE, _FFIE if value else 0)
+
+    @property
+    def threshold(self) -> float:
+        """
+        Free Fall Threshold in g, with 0.0625g resolution, see
+        :attr:`kx132.KX132.free_fall_threshold_g`
+        """
+        return self._sensor.read_register(_FFTH) / 16
+
+    @threshold.setter
+    def threshold(self, value: float) -> None:
+        counts = round(value * 16)
+        if value < 0 or counts > 255:
+            raise ValueError("Value must be between 0 and 15.9375g")
+        self._sensor.update_register(_FFTH, 0xFF, counts)
+
+    @property
+    def counter(self) -> int:
+        """
+        Free Fall Counter, in :attr:`output_data_rate` periods
+        """
+        return self._sensor.read_register(_FFC)
+
+    @counter.setter
+    def counter(self, value: int) -> None:
+        if not 1 <= value <= 255:
+            raise ValueError("Value must be between 1 and 255")
+        self._sensor.update_register(_FFC, 0xFF, value)
+
+    @property
+    def duration(self) -> float:
+        """
+        Free fall duration in milliseconds, stored in :attr:`counter` for the
+        current :attr:`output_data_rate`, so set the rate first
+        """
+        return (
+            self.counter
+            * 1000
+            / free_fall_output_data_rate_values[self.output_data_rate]
+        )
+
+    @duration.setter
+    def duration(self, value: float) -> None:
+        if value <= 0:
+            raise ValueError("Value must be greater than 0")
+        rate = free_fall_output_data_rate_values[self.output_data_rate]
+        self.counter = max(1, round(value * rate / 1000))
+
+    @property
+    def output_data_rate(self) -> int:
+        """
+        Output data rate of the free fall engine, OFFI<2:0>. The rate in Hz
+        for each setting is in :const:`kx132_free_fall.free_fall_output_data_rate_values`
+        """
+        return self._sensor.read_register(_FFCNTL) & _OFFI
+
+    @output_data_rate.setter
+    def output_data_rate(self, value: int) -> None:
+        if value not in range(0, 8):
+            raise ValueError("Value must be a valid free_fall_output_data_rate setting")
+        self._sensor.update_register(_FFCNTL, _OFFI, value)
+
+    @property
+    def latch(self) -> str:
+        """
+        Free fall report latched or not, :py:const:`kx132_free_fall.FF_LATCHED`
+        or :py:const:`kx132_free_fall.FF_UNLATCHED`
+        """
+        values = ("FF_LATCHED", "FF_UNLATCHED")
+        return values[bool(self._sensor.read_register(_FFCNTL) & _ULMODE)]
+
+    @latch.setter
+    def latch(self, value: int) -> None:
+        if value not in free_fall_latch_values:
+            raise ValueError("Value must be a valid free_fall_latch setting")
+        self._sensor.update_register(_FFCNTL, _ULMODE, value << 6)
+
+    @property
+    def delayed_clear(self) -> int:
+        """
+        Delay before an unlatched free fall report is cleared, FFDC<1:0>
+        """
+        return (self._sensor.read_register(_FFCNTL) & _FFDC) >> 4
+
+    @delayed_clear.setter
+    def delayed_clear(self, value: int) -> None:
+        if value not in range(0, 4):
+            raise ValueError("Value must be a valid free_fall_delayed_clear setting")
+        self._sensor.update_register(_FFCNTL, _FFDC, value << 4)
+
+    @property
+    def debounce(self) -> str:
+        """
+        Debounce method of the free fall counter,
+        :py:const:`kx132_free_fall.FF_DEBOUNCE_UP_DOWN` or
+        :py:const:`kx132_free_fall.FF_DEBOUNCE_RESET`
+        """
+        values = ("FF_DEBOUNCE_UP_DOWN", "FF_DEBOUNCE_RESET")
+        return values[bool(self._sensor.read_register(_FFCNTL) & _DCRM)]
+
+    @debounce.setter
+    def debounce(self, value: int) -> None:
+        if value not in free_fall_debounce_values:
+            raise ValueError("Value must be a valid free_fall_debounce setting")
+        self._sensor.update_register(_FFCNTL, _DCRM, value << 3)
+
+    @property
+    def interrupt1(self) -> bool:
+        """Free fall reported on the physical interrupt pin INT1"""
+        return bool(self._sensor.read_register(_INC4) & _FFI)
+
+    @interrupt1.setter
+    def interrupt1(self, value: bool) -> None:
+        self._sensor.update_register(_INC4, _FFI, _FFI if value else 0)
+
+    @property
+    def interrupt2(self) -> bool:
+        """Free fall reported on the physical interrupt pin INT2"""
+        return bool(self._sensor.read_register(_INC6) & _FFI)
+
+    @interrupt2.setter
+    def interrupt2(self, value: bool) -> None:
+        self._sensor.update_register(_INC6, _FFI, _FFI if value else 0)
+
+    @property
+    def detected(self) -> bool:
+        """
+        Free fall reported, FFS bit in INS2. It is also bit 0x80 of the second
+        value of :attr:`kx132_core.KX132Core.interrupt_status`
+        """
+        return bool(self._sensor.read_register(_INS2) & _FFS)
+
+    # pylint: disable=too-many-arguments
+    def setup(
+        self,
+        threshold: float,
+        duration: float,
+        output_data_rate: int = 3,
+        latch: int = FF_LATCHED,
+        debounce: int = FF_DEBOUNCE_UP_DOWN,
+    ) -> None:
+        """
+        Configure and enable the free fall engine, same as
+        :meth:`kx132.KX132.free_fall_setup`
+        """
+        counts, counter, ffcntl = free_fall_settings(
+            threshold, duration, output_data_rate, latch, debounce
+        )
+
+        sensor = self._sensor
+        # Everything is written in a single standby period
+        cntl1 = sensor.read_register(_CNTL1)
+        sensor.write_register(_CNTL1, cntl1 & ~_PC1)
+        sensor.write_register(_FFTH, counts)
+        sensor.write_register(_FFC, counter)
+        delayed_clear = sensor.read_register(_FFCNTL) & _FFDC
+        sensor.write_register(_FFCNTL, ffcntl | delayed_clear)
+        sensor.write_register(_CNTL1, cntl1)
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_orientation`
+================================================================================
+
+Pitch and roll of blocks of Kionix KX132 Accelerometer samples.
+
+With ``ulab`` or ``numpy`` the angles of a whole block are computed at once.
+Without them a table based fixed-point ``atan2`` is used, so there is no
+:func:`math.atan2` call for every sample.
+
+Angles are given in hundredths of a degree, as integers. Pitch is the rotation
+around the Y axis, from -9000 to 9000, and roll the rotation around the X axis,
+from -18000 to 18000.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import math
+import struct
+from array import array
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+_TABLE_BITS = 8
+_TABLE_SIZE = 1 << _TABLE_BITS
+
+# atan(i / 256) in hundredths of a degree, for i in 0..256
+_ATAN_TABLE = tuple(
+    round(math.degrees(math.atan(i / _TABLE_SIZE)) * 100)
+    for i in range(_TABLE_SIZE + 1)
+)
+
+# Half and full turn in Q8 centidegrees, for the smoothing state
+_HALF_TURN = 18000 << 8
+_TURN = 36000 << 8
+
+
+def atan2_centidegrees(y: int, x: int) -> int:
+    """
+    Fixed-point :func:`math.atan2` in hundredths of a degree, from a 257 entries
+    table with linear interpolation. The error is below 0.02 degree.
+
+    :param int y: Y coordinate
+    :param int x: X coordinate
+    """
+    abs_y = -y if y < 0 else y
+    abs_x = -x if x < 0 else x
+    if abs_x == 0 and abs_y == 0:
+        return 0
+    if abs_y <= abs_x:
+        ratio = (abs_y << 16) // abs_x
+    else:
+        ratio = (abs_x << 16) // abs_y
+    index = ratio >> 8
+    angle = _ATAN_TABLE[index]
+    if index < _TABLE_SIZE:
+        angle += ((_ATAN_TABLE[index + 1] - angle) * (ratio & 0xFF)) >> 8
+    if abs_y > abs_x:
+        angle = 9000 - angle
+    if x < 0:
+        angle = 18000 - angle
+    return -angle if y < 0 else angle
+
+
+class Orientation:
+    """Pitch and roll of sample blocks, with optional smoothing.
+
+    Results are kept in :attr:`pitch` and :attr:`roll`, allocated once for
+    ``samples`` samples. They are :class:`array.array` of ``"h"``, or ``int16``
+    arrays when ``ulab`` or ``numpy`` is available.
+
+    :param int samples: Largest block that will be processed
+    :param float smoothing: Weight of the previous angle in an exponential moving
+     average over the samples, from 0 to 0.998. The weight of the new angle is
+     kept in 1/256 steps, so higher values would freeze the output.
+     Defaults to :const:`0`, no smoothing
+
+    **Quickstart: Computing pitch and roll**
+
+    .. code-block:: python
+
+        import board
+        import kx132
+        from kx132_orientation import Orientation
+
+        i2c = board.I2C()
+        kx = kx132.KX132(i2c)
+        orientation = Orientation(32, smoothing=0.8)
+
+        block = bytearray(6 * 32)
+        while True:
+            for start in range(0, len(block), 6):
+                kx.read_acceleration_raw_into(block, start)
+            count = orientation.update(block)
+            print(orientation.pitch[count - 1] / 100, orientation.roll[count - 1] / 100)
+
+    """
+
+    def __init__(self, samples: int, smoothing: float = 0) -> None:
+        if samples < 1:
+            raise ValueError("samples must be >= 1")
+        if not 0 <= smoothing <= 0.998:
+            raise ValueError("smoothing must be between 0 and 0.998")
+        self._samples = samples
+        self._gain = round((1 - smoothing) * 256)
+        self._last_pitch = None
+        self._last_roll = None
+        if np is not None:
+            self.pitch = np.zeros(samples, dtype=np.int16)
+            self.roll = np.zeros(samples, dtype=np.int16)
+        else:
+            self.pitch = array("h", bytes(2 * samples))
+            self.roll = array("h", bytes(2 * samples))
+
+    def reset(self) -> None:
+        """Forget the previous angles, the next sample starts the smoothing again"""
+        self._last_pitch = None
+        self._last_roll = None
+
+    def update(self, block) -> int:
+        """
+        Compute pitch and roll for every sample of ``block``.
+
+        :param block: Raw counts, as filled by
+         :meth:`kx132.KX132.read_acceleration_raw_into`, or scaled samples, as a
+         sequence of ``(x, y, z)`` or an array with three columns
+        :return: Number of samples processed, the results are in the first items of
+         :attr:`pitch` and :attr:`roll`
+        """
+        if isinstance(block, (bytes, bytearray, memoryview)):
+            count = len(block) // 6
+        else:
+            count = len(block)
+        if count > self._samples:
+            raise ValueError("Block is larger than the samples set at construction")
+        if np is not None:
+            self._update_vector(block, count)
+        else:
+            self._update_table(block, count)
+        if count and self._gain != 256:
+            self._smooth(count)
+        return count
+
+    def _update_vector(self, block, count: int) -> None:
+        if isinstance(block, (bytes, bytearray, memoryview)):
+            values = np.frombuffer(block, dtype=np.int16, count=count * 3)
+            values = values.reshape((count, 3))
+        else:
+            values = np.array(block)
+        x = values[:, 0] * 1.0
+        y = values[:, 1] * 1.0
+        z = values[:, 2] * 1.0
+        scale = 18000 / math.pi
+        self.pitch[:count] = np.around(np.arctan2(-x, np.sqrt(y * y + z * z)) * scale)
+        self.roll[:count] = np.around(np.arctan2(y, z) * scale)
+
+    def _update_table(self, block, count: int) -> None:
+        pitch = self.pitch
+        roll = self.roll
+        raw = isinstance(block, (bytes, bytearray, memoryview))
+        for i in range(count):
+            if raw:
+                x, y, z = struct.unpack_from("<hhh", block, i * 6)
+            else:
+                # Scaled samples, the angles only depend on the ratios
+                x, y, z = (int(value * 16384) for value in block[i])
+            pitch[i] = atan2_centidegrees(-x, int(math.sqrt(y * y + z * z)))
+            roll[i] = atan2_centidegrees(y, z)
+
+    def _smooth(self, count: int) -> None:
+        # The state is kept in Q8 so the steps are not truncated to whole
+        # centidegrees, and rounded only when stored in the results
+        gain = self._gain
+        pitch = self.pitch
+        roll = self.roll
+        last_pitch = self._last_pitch
+        last_roll = self._last_roll
+        if last_pitch is None:
+            last_pitch = int(pitch[0]) << 8
+            last_roll = int(roll[0]) << 8
+        for i in range(count):
+            last_pitch += (((int(pitch[i]) << 8) - last_pitch) * gain) >> 8
+            delta = (int(roll[i]) << 8) - last_roll
+            # Roll wraps around at 180 degrees, smooth along the short way
+            if delta > _HALF_TURN:
+                delta -= _TURN
+            elif delta < -_HALF_TURN:
+                delta += _TURN
+            last_roll += (delta * gain) >> 8
+            if last_roll > _HALF_TURN:
+                last_roll -= _TURN
+            elif last_roll < -_HALF_TURN:
+                last_roll += _TURN
+            pitch[i] = (last_pitch + 128) >> 8
+            roll[i] = (last_roll + 128) >> 8
+        self._last_pitch = last_pitch
+        self._last_roll = last_roll
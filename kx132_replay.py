@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_replay`
+================================================================================
+
+Record and replay the I2C transactions of a Kionix KX132 Accelerometer session.
+
+:class:`RecordingI2C` wraps the bus of a live session and logs every transaction
+to a compact binary file. :class:`ReplayI2C` serves those responses back, so the
+same session can be run again with :class:`kx132.KX132` without the sensor.
+
+Each record is a header packed as ``<BBIHH``: the transaction kind, the device
+address, the time since the previous record in microseconds, the number of bytes
+written and the number of bytes read. The written bytes, starting with the
+register address, follow the header, then the read bytes.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import struct
+import time
+
+try:
+    from typing import Optional
+except ImportError:
+    pass
+
+# pylint: disable=too-many-arguments
+
+_MAGIC = b"KX1R"
+_HEADER = "<BBIHH"
+_HEADER_SIZE = struct.calcsize(_HEADER)
+
+_WRITE = 0
+_READ = 1
+_WRITE_THEN_READ = 2
+_ERROR = 0x80
+
+
+def _span(buf, start: int, end: Optional[int]):
+    if end is None:
+        end = len(buf)
+    return start, end
+
+
+class RecordingI2C:
+    """Wrap an I2C bus and record every transaction to ``stream``.
+
+    :param ~busio.I2C i2c_bus: The I2C bus the KX132 is connected to
+    :param stream: A binary file opened for writing
+
+    **Quickstart: Recording a session**
+
+    .. code-block:: python
+
+        import board
+        import kx132
+        from kx132_replay import RecordingI2C
+
+        with open("session.kxr", "wb") as stream:
+            i2c = RecordingI2C(board.I2C(), stream)
+            kx = kx132.KX132(i2c)
+            for _ in range(1000):
+                print(kx.acceleration)
+
+    """
+
+    def __init__(self, i2c_bus, stream) -> None:
+        self._i2c = i2c_bus
+        self._stream = stream
+        self._last = time.monotonic_ns()
+        stream.write(_MAGIC)
+
+    def _record(self, kind: int, address: int, out_data, in_data, in_len=None) -> None:
+        now = time.monotonic_ns()
+        delta = min((now - self._last) // 1000, 0xFFFFFFFF)
+        self._last = now
+        if in_len is None:
+            in_len = len(in_data)
+        self._stream.write(
+            struct.pack(_HEADER, kind, address, delta, len(out_data), in_len)
+        )
+        self._stream.write(out_data)
+        self._stream.write(in_data)
+
+    def _record_error(self, kind: int, address: int, error: OSError) -> None:
+        # The errno goes in the read length so the replay can raise it again
+        self._record(kind | _ERROR, address, b"", b"", error.errno or 0)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end=None) -> None:
+        """Write ``buffer[start:end]`` to the device and record it"""
+        start, end = _span(buffer, start, end)
+        try:
+            self._i2c.writeto(address, buffer, start=start, end=end)
+        except OSError as error:
+            self._record_error(_WRITE, address, error)
+            raise
+        self._record(_WRITE, address, bytes(buffer[start:end]), b"")
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end=None) -> None:
+        """Read from the device into ``buffer[start:end]`` and record it"""
+        start, end = _span(buffer, start, end)
+        try:
+            self._i2c.readfrom_into(address, buffer, start=start, end=end)
+        except OSError as error:
+            self._record_error(_READ, address, error)
+            raise
+        self._record(_READ, address, b"", bytes(buffer[start:end]))
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        buffer_out,
+        buffer_in,
+        *,
+        out_start: int = 0,
+        out_end=None,
+        in_start: int = 0,
+        in_end=None
+    ) -> None:
+        """Write to the device then read the response, and record both"""
+        out_start, out_end = _span(buffer_out, out_start, out_end)
+        in_start, in_end = _span(buffer_in, in_start, in_end)
+        try:
+            self._i2c.writeto_then_readfrom(
+                address,
+                buffer_out,
+                buffer_in,
+                out_start=out_start,
+                out_end=out_end,
+                in_start=in_start,
+                in_end=in_end,
+            )
+        except OSError as error:
+            self._record_error(_WRITE_THEN_READ, address, error)
+            raise
+        self._record(
+            _WRITE_THEN_READ,
+            address,
+            bytes(buffer_out[out_start:out_end]),
+            bytes(buffer_in[in_start:in_end]),
+        )
+
+    def try_lock(self) -> bool:
+        """Lock the wrapped bus"""
+        return self._i2c.try_lock()
+
+    def unlock(self) -> None:
+        """Unlock the wrapped bus"""
+        self._i2c.unlock()
+
+    def scan(self) -> list:
+        """Scan the wrapped bus. Scans are not recorded"""
+        return self._i2c.scan()
+
+
+class ReplayI2C:
+    """Replay a session recorded with :class:`RecordingI2C`.
+
+    Every transaction must match the recorded one, kind, address and written bytes,
+    otherwise :class:`RuntimeError` is raised because the driver no longer follows
+    the recorded session.
+
+    :param stream: A binary file opened for reading
+    :param bool timing: Wait between transactions as long as the recorded session did.
+     Defaults to `False`, replay as fast as possible
+
+    **Quickstart: Replaying a session**
+
+    .. code-block:: python
+
+        import kx132
+        from kx132_replay import ReplayI2C
+
+        with open("session.kxr", "rb") as stream:
+            kx = kx132.KX132(ReplayI2C(stream))
+            for _ in range(1000):
+                print(kx.acceleration)
+
+    """
+
+    def __init__(self, stream, timing: bool = False) -> None:
+        if stream.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Stream is not a KX132 recording")
+        self._stream = stream
+        self._timing = timing
+        self._header = bytearray(_HEADER_SIZE)
+        self._next = time.monotonic_ns()
+        self._locked = False
+        self.transactions = 0
+        """Number of transactions replayed so far"""
+
+    def _replay(self, kind: int, address: int, out_data, buffer_in, in_start, in_end):
+        if self._stream.readinto(self._header) != _HEADER_SIZE:
+            raise RuntimeError("Replay exhausted")
+        rec_kind, rec_address, delta, out_len, in_len = struct.unpack(
+            _HEADER, self._header
+        )
+        rec_out = self._stream.read(out_len)
+        errno = None
+        if rec_kind & _ERROR:
+            # Failed transactions store the errno in place of the read length
+            errno, in_len = in_len, 0
+            rec_kind &= ~_ERROR
+            rec_out = out_data
+        if rec_kind != kind or rec_address != address or rec_out != out_data:
+            raise RuntimeError(
+                "Replay diverged at transaction {}".format(self.transactions)
+            )
+        if self._timing:
+            self._next += delta * 1000
+            wait = self._next - time.monotonic_ns()
+            if wait > 0:
+                time.sleep(wait / 1e9)
+        self.transactions += 1
+        if errno is not None:
+            raise OSError(errno)
+        if in_len != in_end - in_start:
+            raise RuntimeError(
+                "Replay diverged at transaction {}".format(self.transactions - 1)
+            )
+        if in_len:
+            buffer_in[in_start:in_end] = self._stream.read(in_len)
+
+    def writeto(self, address: int, buffer, *, start: int = 0, end=None) -> None:
+        """Check ``buffer[start:end]`` against the recorded write"""
+        start, end = _span(buffer, start, end)
+        self._replay(_WRITE, address, bytes(buffer[start:end]), None, 0, 0)
+
+    def readfrom_into(self, address: int, buffer, *, start: int = 0, end=None) -> None:
+        """Fill ``buffer[start:end]`` with the recorded read"""
+        start, end = _span(buffer, start, end)
+        self._replay(_READ, address, b"", buffer, start, end)
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        buffer_out,
+        buffer_in,
+        *,
+        out_start: int = 0,
+        out_end=None,
+        in_start: int = 0,
+        in_end=None
+    ) -> None:
+        """Check the write against the recording and fill the read with the recorded bytes"""
+        out_start, out_end = _span(buffer_out, out_start, out_end)
+        in_start, in_end = _span(buffer_in, in_start, in_end)
+        self._replay(
+            _WRITE_THEN_READ,
+            address,
+            bytes(buffer_out[out_start:out_end]),
+            buffer_in,
+            in_start,
+            in_end,
+        )
+
+    def try_lock(self) -> bool:
+        """Lock the replay bus"""
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self) -> None:
+        """Unlock the replay bus"""
+        self._locked = False
+
+    def scan(self) -> list:  # pylint: disable=no-self-use
+        """Scans are not recorded, an empty list is returned"""
+        return []
@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_tap`
+================================================================================
+
+Tap/Double Tap engine of the Kionix KX132 Accelerometer, for
+:class:`kx132_core.KX132Core`
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+from micropython import const
+from kx132_common import tap_doubletap_report_values  # pylint: disable=unused-import
+
+_INS1 = const(0x16)
+_CNTL1 = const(0x1B)
+_TDTE = const(0x04)
+
+
+class Tap:
+    """Tap/Double Tap engine. Use it through :attr:`kx132_core.KX132Core.tap`
+
+    :param ~kx132_core.KX132Core sensor: The sensor
+    """
+
+    def __init__(self, sensor) -> None:
+        self._sensor = sensor
+
+    @property
+    def enabled(self) -> bool:
+        """Tap/Double Tap engine enabled, TDTE bit in CNTL1"""
+        return bool(self._sensor.read_register(_CNTL1) & _TDTE)
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._sensor.update_register(_CNTL1, _TDTE, _TDTE if value else 0)
+
+    @property
+    def report(self) -> int:
+        """
+        Tap/Double Tap report, INS1. The description of each value is in
+        :const:`kx132_tap.tap_doubletap_report_values`. It is cleared when the
+        interrupt is released, see :attr:`kx132_core.KX132Core.interrupt_status`
+        to read and release it in one go.
+        """
+        return self._sensor.read_register(_INS1)
@@ -0,0 +1,323 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_telemetry`
+================================================================================
+
+Batched binary framing of Kionix KX132 Accelerometer sample blocks.
+
+:class:`TelemetryWriter` packs raw sample blocks, as filled by
+:meth:`kx132.KX132.read_acceleration_raw_into`, into frames up to a byte budget
+and hands each frame to a sink in a single write.
+
+Each frame is a header packed as ``<2sBBIIBH``: the ``KX`` magic, the format
+version, the sensor id, the frame sequence number, the index of the first sample,
+the :attr:`~kx132.KX132.acc_range` setting and the number of samples. The raw
+samples follow, then a CRC-16/CCITT-FALSE of everything before it, as ``<H``.
+On byte streams, :func:`find_frame` locates the frames for :func:`decode_frame`.
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+import struct
+
+try:
+    from binascii import crc_hqx
+except ImportError:
+    crc_hqx = None
+
+try:
+    from typing import Optional, Tuple
+except ImportError:
+    pass
+
+_MAGIC = b"KX"
+_VERSION = 1
+_HEADER = "<2sBBIIBH"
+HEADER_SIZE = struct.calcsize(_HEADER)
+CRC_SIZE = 2
+
+# acc_range settings, kx132.ACC_RANGE_2 to kx132.ACC_RANGE_16. They are not
+# imported so receivers can decode frames without the driver dependencies
+_ACC_RANGE_2 = 0
+_ACC_RANGE_16 = 3
+
+
+def _crc_table() -> Tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021 if crc & 0x8000 else crc << 1) & 0xFFFF
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = None if crc_hqx is not None else _crc_table()
+
+
+def crc16(data, crc: int = 0xFFFF) -> int:
+    """
+    CRC-16/CCITT-FALSE of ``data``
+
+    :param data: Bytes to check
+    :param int crc: Initial value. Defaults to :const:`0xFFFF`
+    """
+    if crc_hqx is not None:
+        return crc_hqx(data, crc)
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def decode_frame(frame) -> Tuple[int, int, int, int, memoryview]:
+    """
+    Check and unpack a frame written by :class:`TelemetryWriter`.
+
+    :param frame: The received frame
+    :raises ValueError: if the frame is truncated, is not a KX132 frame or the CRC
+     does not match
+    :return: sensor id, sequence number, index of the first sample, acc_range
+     setting and the raw samples
+    """
+    if len(frame) < HEADER_SIZE + CRC_SIZE:
+        raise ValueError("Frame is truncated")
+    (
+        magic,
+        version,
+        sensor_id,
+        sequence,
+        first_sample,
+        acc_range,
+        samples,
+    ) = struct.unpack_from(_HEADER, frame)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a KX132 frame")
+    end = HEADER_SIZE + samples * 6
+    if len(frame) != end + CRC_SIZE:
+        raise ValueError("Frame is truncated")
+    view = memoryview(frame)
+    if crc16(view[:end]) != struct.unpack_from("<H", frame, end)[0]:
+        raise ValueError("Frame CRC does not match")
+    return sensor_id, sequence, first_sample, acc_range, view[HEADER_SIZE:end]
+
+
+def find_frame(buffer, start: int = 0, max_frame_size: int = 1400) -> Tuple[int, int]:
+    """
+    Find the next frame in bytes received from a stream, like a serial port,
+    where frames arrive back to back and may be split across reads.
+
+    :param buffer: Received bytes
+    :param int start: Offset where the search starts. Defaults to :const:`0`
+    :param int max_frame_size: Largest frame accepted, as given to
+     :class:`TelemetryWriter`. A header announcing a longer frame is treated as
+     noise, so a corrupted length does not hold the search. Defaults to :const:`1400`
+    :return: Offset of the ``KX`` magic and length of the frame, header and CRC
+     included. The length is :const:`0` while the header is incomplete. Without a
+     magic, the offset is where one could still begin, so the bytes before it can
+     be dropped. Pass the frame to :func:`decode_frame` once it is complete, and
+     search again from the next byte if it does not decode.
+
+    .. code-block:: python
+
+        received = bytearray()
+        while True:
+            received.extend(uart.read(64) or b"")
+            offset, length = find_frame(received)
+            if length and len(received) >= offset + length:
+                try:
+                    samples = decode_frame(received[offset : offset + length])[4]
+                    offset += length
+                except ValueError:
+                    # Not a frame after all, resync from the next byte
+                    offset += 1
+            del received[:offset]
+    """
+    size = len(buffer)
+    while start < size - 1:
+        if buffer[start] == _MAGIC[0] and buffer[start + 1] == _MAGIC[1]:
+            if size < start + HEADER_SIZE:
+                return start, 0
+            if buffer[start + 2] == _VERSION:
+                samples = struct.unpack_from("<H", buffer, start + HEADER_SIZE - 2)[0]
+                length = HEADER_SIZE + samples * 6 + CRC_SIZE
+                if length <= max_frame_size:
+                    return start, length
+        start += 1
+    if start < size and buffer[start] != _MAGIC[0]:
+        start += 1
+    return start, 0
+
+
+class SerialSink:
+    """Send frames to a serial port
+
+    :param uart: A :class:`busio.UART` or :class:`serial.Serial`
+    """
+
+    def __init__(self, uart) -> None:
+        self._uart = uart
+
+    def send(self, frame) -> None:
+        """Write a frame to the serial port"""
+        self._uart.write(frame)
+
+    def close(self) -> None:
+        """Nothing to release, the serial port belongs to the caller"""
+
+
+class SocketSink:
+    """Send frames through a socket, one datagram per frame for UDP
+
+    :param sock: A socket from :mod:`socket` or :mod:`socketpool`
+    :param address: Destination address for a not connected socket, as ``(host, port)``.
+     Defaults to `None`, use :meth:`send` on a connected socket
+    """
+
+    def __init__(self, sock, address: Optional[Tuple[str, int]] = None) -> None:
+        self._sock = sock
+        self._address = address
+
+    def send(self, frame) -> None:
+        """Send a frame through the socket"""
+        if self._address is not None:
+            self._sock.sendto(frame, self._address)
+            return
+        # A stream socket may take only part of the frame at a time
+        view = memoryview(frame)
+        sent = 0
+        while sent < len(view):
+            sent += self._sock.send(view[sent:])
+
+    def close(self) -> None:
+        """Close the socket"""
+        self._sock.close()
+
+
+class TelemetryWriter:
+    """Batch raw sample blocks into frames and send them to a sink.
+
+    A sink is any object with ``send(frame)`` and ``close()`` methods, like
+    :class:`SerialSink` or :class:`SocketSink`. The frame passed to ``send`` is a
+    :class:`memoryview` over a buffer reused for the next frame.
+
+    :param sink: Where frames are sent
+    :param int sensor_id: Id written in every frame. Defaults to :const:`0`
+    :param int acc_range: :attr:`~kx132.KX132.acc_range` setting of the samples.
+     Defaults to :const:`kx132.ACC_RANGE_2`
+    :param int max_frame_size: Largest frame in bytes, header and CRC included.
+     Defaults to :const:`1400`, below the usual Ethernet UDP payload limit
+
+    **Quickstart: Streaming blocks over UDP**
+
+    .. code-block:: python
+
+        import socket
+        import board
+        import kx132
+        from kx132_telemetry import SocketSink, TelemetryWriter
+
+        i2c = board.I2C()
+        kx = kx132.KX132(i2c)
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        writer = TelemetryWriter(SocketSink(sock, ("192.168.1.10", 5005)))
+
+        block = bytearray(6 * 32)
+        while True:
+            for start in range(0, len(block), 6):
+                kx.read_acceleration_raw_into(block, start)
+            writer.write_block(block)
+
+    """
+
+    def __init__(
+        self,
+        sink,
+        sensor_id: int = 0,
+        acc_range: int = _ACC_RANGE_2,
+        max_frame_size: int = 1400,
+    ) -> None:
+        if not _ACC_RANGE_2 <= acc_range <= _ACC_RANGE_16:
+            raise ValueError("Value must be a valid acc_range setting")
+        if not 0 <= sensor_id <= 255:
+            raise ValueError("sensor_id must be between 0 and 255")
+        capacity = (max_frame_size - HEADER_SIZE - CRC_SIZE) // 6
+        if capacity < 1:
+            raise ValueError("max_frame_size is too small for one sample")
+
+        self._sink = sink
+        self._sensor_id = sensor_id
+        self._acc_range = acc_range
+        self._capacity = capacity
+        self._frame = bytearray(HEADER_SIZE + capacity * 6 + CRC_SIZE)
+        self._view = memoryview(self._frame)
+        self._samples = 0
+        self._first_sample = 0
+        self.sequence = 0
+        """Sequence number of the next frame"""
+
+    @property
+    def acc_range(self) -> int:
+        """:attr:`~kx132.KX132.acc_range` setting written in the next frames"""
+        return self._acc_range
+
+    @acc_range.setter
+    def acc_range(self, value: int) -> None:
+        if not _ACC_RANGE_2 <= value <= _ACC_RANGE_16:
+            raise ValueError("Value must be a valid acc_range setting")
+        # Samples already queued were taken with the previous range
+        self.flush()
+        self._acc_range = value
+
+    def write_block(self, block) -> None:
+        """
+        Queue a block of raw samples. Full frames are sent as soon as they fill up.
+
+        :param block: Raw samples, 6 bytes each
+        """
+        view = memoryview(block)
+        total = len(block) // 6
+        done = 0
+        while done < total:
+            count = min(total - done, self._capacity - self._samples)
+            start = HEADER_SIZE + self._samples * 6
+            self._view[start : start + count * 6] = view[done * 6 : (done + count) * 6]
+            self._samples += count
+            done += count
+            if self._samples == self._capacity:
+                self.flush()
+
+    def flush(self) -> None:
+        """Send the queued samples, if any, as a frame"""
+        samples = self._samples
+        if not samples:
+            return
+        end = HEADER_SIZE + samples * 6
+        struct.pack_into(
+            _HEADER,
+            self._frame,
+            0,
+            _MAGIC,
+            _VERSION,
+            self._sensor_id,
+            self.sequence,
+            self._first_sample,
+            self._acc_range,
+            samples,
+        )
+        struct.pack_into("<H", self._frame, end, crc16(self._view[:end]))
+        self._sink.send(self._view[: end + CRC_SIZE])
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        self._first_sample = (self._first_sample + samples) & 0xFFFFFFFF
+        self._samples = 0
+
+    def close(self) -> None:
+        """Send the queued samples and close the sink"""
+        self.flush()
+        self._sink.close()
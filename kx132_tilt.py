@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+"""
+`kx132_tilt`
+================================================================================
+
+Tilt position engine of the Kionix KX132 Accelerometer, for :class:`kx132_core.KX132Core`
+
+
+* Author(s): Jose D. Montoya
+
+
+"""
+
+from micropython import const
+
+# Tilt position states, shared with kx132
+# pylint: disable=unused-import
+from kx132_common import (
+    TILT_FACE_UP,
+    TILT_FACE_DOWN,
+    TILT_UP,
+    TILT_DOWN,
+    TILT_RIGHT,
+    TILT_LEFT,
+    tilt_position_values,
+)
+
+# pylint: enable=unused-import
+
+_TILT_POSITION = const(0x14)
+_PREVIOUS_TILT_POSITION = const(0x15)
+_CNTL1 = const(0x1B)
+_TPE = const(0x01)
+
+
+class Tilt:
+    """Tilt position engine. Use it through :attr:`kx132_core.KX132Core.tilt`
+
+    :param ~kx132_core.KX132Core sensor: The sensor
+    """
+
+    def __init__(self, sensor) -> None:
+        self._sensor = sensor
+
+    @property
+    def enabled(self) -> bool:
+        """Tilt position engine enabled, TPE bit in CNTL1"""
+        return bool(self._sensor.read_register(_CNTL1) & _TPE)
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._sensor.update_register(_CNTL1, _TPE, _TPE if value else 0)
+
+    @property
+    def position(self) -> int:
+        """
+        Current Sensor tilt position, one of :py:const:`kx132_tilt.TILT_FACE_UP`,
+        :py:const:`kx132_tilt.TILT_FACE_DOWN`, :py:const:`kx132_tilt.TILT_UP`,
+        :py:const:`kx132_tilt.TILT_DOWN`, :py:const:`kx132_tilt.TILT_RIGHT` or
+        :py:const:`kx132_tilt.TILT_LEFT`. The description of each of them is
+        in :const:`kx132_tilt.tilt_position_values`
+        """
+        return self._sensor.read_register(_TILT_POSITION)
+
+    @property
+    def previous_position(self) -> int:
+        """
+        Previous Sensor tilt position. Same values as :attr:`position`
+        """
+        return self._sensor.read_register(_PREVIOUS_TILT_POSITION)
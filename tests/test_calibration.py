@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import random
+import struct
+
+import pytest
+
+import kx132_calibration
+from kx132_calibration import Calibration
+
+PATHS = ("integer", "numpy", "ulab")
+
+
+def _apply(calibration, block, path, monkeypatch):
+    # The ulab path only uses calls numpy has too, so it runs on numpy here
+    if path == "integer":
+        monkeypatch.setattr(kx132_calibration, "np", None)
+    monkeypatch.setattr(kx132_calibration, "_ULAB", path == "ulab")
+    calibration._set(  # pylint: disable=protected-access
+        calibration.matrix, calibration.bias
+    )
+    out = bytearray(len(block))
+    calibration.apply(block, out)
+    return out
+
+
+def _block(*samples):
+    return bytearray(struct.pack("<%dh" % (len(samples) * 3), *sum(samples, ())))
+
+
+@pytest.mark.parametrize("path", PATHS[1:])
+def test_paths_match_integer(path, monkeypatch):
+    generator = random.Random(1)
+    block = bytearray(
+        struct.pack("<300h", *(generator.randint(-32768, 32767) for _ in range(300)))
+    )
+    calibration = Calibration(
+        (12.3, -40.5, 7.5),
+        (1.01, 0.98, 1.002),
+        ((0.999, -0.04, 0.01), (0.04, 0.999, 0), (-0.01, 0, 1)),
+    )
+    expected = bytearray(len(block))
+    calibration._apply_integer(block, expected)  # pylint: disable=protected-access
+    assert _apply(calibration, block, path, monkeypatch) == expected
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_rounds_half_up(path, monkeypatch):
+    calibration = Calibration((0.5, -0.5, 1.5))
+    out = _apply(calibration, _block((0, 0, 0)), path, monkeypatch)
+    assert struct.unpack("<hhh", out) == (0, 1, -1)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_saturates_to_16_bits(path, monkeypatch):
+    calibration = Calibration(gain=(2, 2, 1))
+    block = _block((30000, -30000, 5), (-1, 1, -32768))
+    out = _apply(calibration, block, path, monkeypatch)
+    assert struct.unpack("<6h", out) == (32767, -32768, 5, -2, 2, -32768)
+
+
+def test_in_place_by_default():
+    block = _block((100, 200, 300))
+    Calibration(offset=(10, 20, 30)).apply(block)
+    assert struct.unpack("<hhh", block) == (90, 180, 270)
+
+
+def test_from_captures_fit():
+    scale = 2 / 2**15
+    offset = (120, -80, 45)
+    gain = (1.02, 0.97, 1.01)
+    references = (
+        (1, 0, 0),
+        (-1, 0, 0),
+        (0, 1, 0),
+        (0, -1, 0),
+        (0, 0, 1),
+        (0, 0, -1),
+    )
+    captures = [
+        _block(
+            *[
+                tuple(
+                    round(ref[axis] / scale / gain[axis] + offset[axis])
+                    for axis in range(3)
+                )
+            ]
+            * 4
+        )
+        for ref in references
+    ]
+    calibration = Calibration.from_captures(captures, references, scale)
+
+    for axis in range(3):
+        assert calibration.matrix[axis][axis] == pytest.approx(gain[axis], rel=1e-3)
+        assert calibration.bias[axis] == pytest.approx(
+            -gain[axis] * offset[axis], abs=1
+        )
+    block = captures[4][:6]
+    calibration.apply(block)
+    assert struct.unpack("<hhh", block) == pytest.approx((0, 0, 1 / scale), abs=1)
+
+
+def test_from_captures_needs_four():
+    with pytest.raises(ValueError):
+        Calibration.from_captures([_block((0, 0, 16384))] * 3, [(0, 0, 1)] * 3, 1)
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 Jose D. Montoya
+#
+# SPDX-License-Identifier: MIT
+
+import io
+import socket
+
+from kx132_telemetry import (
+    HEADER_SIZE,
+    SerialSink,
+    SocketSink,
+    TelemetryWriter,
+    crc16,
+    decode_frame,
+    find_frame,
+)
+
+SAMPLES = bytes(range(256)) * 3
+
+
+def test_crc16_check_value():
+    assert crc16(b"123456789") == 0x29B1
+
+
+def test_udp_loopback_round_trip():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(1)
+    try:
+        writer = TelemetryWriter(
+            SocketSink(sender, receiver.getsockname()),
+            sensor_id=7,
+            acc_range=2,
+            max_frame_size=100,
+        )
+        writer.write_block(SAMPLES[: 6 * 50])
+        writer.close()
+
+        received = b""
+        first_samples = []
+        for sequence in range(4):
+            sensor_id, seq, first_sample, acc_range, samples = decode_frame(
+                receiver.recv(2048)
+            )
+            assert (sensor_id, seq, acc_range) == (7, sequence, 2)
+            first_samples.append(first_sample)
+            received += bytes(samples)
+        assert first_samples == [0, 13, 26, 39]
+        assert received == SAMPLES[: 6 * 50]
+    finally:
+        receiver.close()
+
+
+def _read_stream(data, chunk):
+    received = bytearray()
+    samples = b""
+    for start in range(0, len(data), chunk):
+        received.extend(data[start : start + chunk])
+        offset, length = find_frame(received, max_frame_size=100)
+        while length and len(received) >= offset + length:
+            try:
+                samples += bytes(decode_frame(received[offset : offset + length])[4])
+                offset += length
+            except ValueError:
+                offset += 1
+            offset, length = find_frame(received, offset, max_frame_size=100)
+        del received[:offset]
+    return samples, received
+
+
+def test_find_frame_in_stream():
+    stream = io.BytesIO()
+    writer = TelemetryWriter(SerialSink(stream), max_frame_size=100)
+    writer.write_block(SAMPLES[: 6 * 20])
+    writer.flush()
+    samples, received = _read_stream(b"\x00K" + stream.getvalue(), 7)
+    assert samples == SAMPLES[: 6 * 20]
+    assert not received
+
+
+def test_find_frame_resync():
+    stream = io.BytesIO()
+    writer = TelemetryWriter(SerialSink(stream), max_frame_size=100)
+    writer.write_block(SAMPLES[: 6 * 13])
+    writer.flush()
+    good = stream.getvalue()
+    # A header announcing 0xFFFF samples, then a frame with a bad CRC
+    huge = bytearray(good[:HEADER_SIZE])
+    huge[HEADER_SIZE - 2 : HEADER_SIZE] = b"\xff\xff"
+    bad = bytearray(good)
+    bad[HEADER_SIZE] ^= 1
+    samples, received = _read_stream(bytes(huge + bad) + good, 9)
+    assert samples == SAMPLES[: 6 * 13]
+    assert len(received) < HEADER_SIZE
+
+
+class _ShortSendSocket:
+    """Connected stream socket that takes at most 5 bytes per send"""
+
+    def __init__(self):
+        self.data = b""
+
+    def send(self, data):
+        self.data += bytes(data[:5])
+        return len(data[:5])
+
+    def close(self):
+        pass
+
+
+def test_socket_sink_whole_frames():
+    sock = _ShortSendSocket()
+    writer = TelemetryWriter(SocketSink(sock))
+    writer.write_block(SAMPLES[: 6 * 20])
+    writer.close()
+    assert bytes(decode_frame(sock.data)[4]) == SAMPLES[: 6 * 20]